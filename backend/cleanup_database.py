@@ -6,23 +6,27 @@ from sqlalchemy.orm import sessionmaker
 from database.database import engine
 from database.models import Car
 import logging
+import re
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Keywords to identify poor quality listings
+BAD_KEYWORDS = (
+    'INKOOP', 'GEZOCHT', 'Sprinter', 'Crafter', 'Transit', 'Iveco',
+    'bestelauto', 'bestelwagen', 'vrachtwagen', 'truck', 'lease'
+)
+
+# One case-insensitive pass per listing instead of a substring test per keyword
+_BAD_KEYWORDS_RE = re.compile('|'.join(map(re.escape, BAD_KEYWORDS)), re.IGNORECASE)
+
 def cleanup_database():
     """Remove poor quality car listings"""
     session = SessionLocal()
 
     try:
-        # Keywords to identify poor quality listings
-        bad_keywords = [
-            'INKOOP', 'GEZOCHT', 'Sprinter', 'Crafter', 'Transit', 'Iveco',
-            'bestelauto', 'bestelwagen', 'vrachtwagen', 'truck', 'lease'
-        ]
-
         deleted_count = 0
 
         # Get all cars
@@ -30,19 +34,16 @@ def cleanup_database():
         logger.info(f"Found {len(cars)} total cars in database")
 
         for car in cars:
-            title_lower = car.title.lower() if car.title else ""
-            desc_lower = car.description.lower() if car.description else ""
-            text = title_lower + " " + desc_lower
+            text = (car.title or "") + " " + (car.description or "")
 
             # Check if car should be deleted
             should_delete = False
 
             # Check for bad keywords
-            for keyword in bad_keywords:
-                if keyword.lower() in text:
-                    should_delete = True
-                    logger.info(f"Deleting car with keyword '{keyword}': {car.title}")
-                    break
+            keyword_match = _BAD_KEYWORDS_RE.search(text)
+            if keyword_match:
+                should_delete = True
+                logger.info(f"Deleting car with keyword '{keyword_match.group(0)}': {car.title}")
 
             # Check for suspiciously low prices (likely lease monthly payments)
             if car.price and car.price < 1300:
@@ -18,9 +18,35 @@ import time
 import random
 import re
 from collections import defaultdict
+import ahocorasick
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Titles with any of these are excluded from market prices
+DAMAGE_KEYWORDS = (
+    'schade', 'damage', 'beschadigd', 'damaged', 'deuk', 'dent', 'kras', 'scratch',
+    'ongeluk', 'accident', 'botsen', 'crash', 'herstel', 'repair', 'reparatie',
+    'lakschade', 'hagelschade', 'export', 'onderdelen', 'parts', 'defect'
+)
+
+
+def _build_damage_automaton() -> ahocorasick.Automaton:
+    """Build an Aho-Corasick automaton so a title is scanned once for all keywords"""
+    automaton = ahocorasick.Automaton()
+    for keyword in DAMAGE_KEYWORDS:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+_DAMAGE_AC = _build_damage_automaton()
+
+# Per-listing patterns, compiled once
+_PRICE_EUR_RE = re.compile(r'€\s*[\d.,]+')
+_YEAR_RE = re.compile(r'\b(20[0-2][0-9])\b')
+_MILEAGE_RE = re.compile(r'(\d{1,3}(?:[.,]\d{3})*)\s*km', re.IGNORECASE)
+_NON_NUMERIC_RE = re.compile(r'[^\d.,]')
+
 class MarketDataCollector:
     def __init__(self, headless=True):
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -163,22 +189,22 @@ class MarketDataCollector:
         try:
             # Get listing HTML
             html = listing.get_attribute('outerHTML')
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = BeautifulSoup(html, 'lxml')
 
             # Extract title
             title_elem = soup.find(['h3', 'h2'])
             title = title_elem.get_text(strip=True) if title_elem else ""
 
             # Extract price
-            price_elem = soup.find(text=re.compile(r'€\s*[\d.,]+'))
+            price_elem = soup.find(text=_PRICE_EUR_RE)
             price = self.clean_price(price_elem) if price_elem else None
 
             # Extract year from title
-            year_match = re.search(r'\b(20[0-2][0-9])\b', title)
+            year_match = _YEAR_RE.search(title)
             year = int(year_match.group(1)) if year_match else None
 
             # Extract mileage
-            mileage_match = re.search(r'(\d{1,3}(?:[.,]\d{3})*)\s*km', title, re.IGNORECASE)
+            mileage_match = _MILEAGE_RE.search(title)
             mileage = self.clean_mileage(mileage_match.group(1)) if mileage_match else None
 
             # Only include cars with valid price and year in our range
@@ -202,23 +228,19 @@ class MarketDataCollector:
 
     def filter_non_damaged_cars(self, cars: List[Dict], brand: str, model: str) -> List[Dict]:
         """Filter out cars with damage keywords"""
-        damage_keywords = [
-            'schade', 'damage', 'beschadigd', 'damaged', 'deuk', 'dent', 'kras', 'scratch',
-            'ongeluk', 'accident', 'botsen', 'crash', 'herstel', 'repair', 'reparatie',
-            'lakschade', 'hagelschade', 'export', 'onderdelen', 'parts', 'defect'
-        ]
-
+        brand_lower = brand.lower()
+        model_lower = model.lower()
         filtered_cars = []
 
         for car in cars:
             title_lower = car['title'].lower()
 
             # Check if title contains the target brand/model
-            if brand.lower() not in title_lower or model.lower() not in title_lower:
+            if brand_lower not in title_lower or model_lower not in title_lower:
                 continue
 
-            # Check for damage keywords
-            has_damage = any(keyword in title_lower for keyword in damage_keywords)
+            # Check for damage keywords; the first hit is enough
+            has_damage = next(_DAMAGE_AC.iter(title_lower), None) is not None
 
             if not has_damage:
                 filtered_cars.append(car)
@@ -289,7 +311,7 @@ class MarketDataCollector:
 
         # Remove currency symbols and extract numbers
         price_text = str(price_text).replace("€", "").replace("EUR", "").replace(",-", "")
-        price_text = re.sub(r'[^\d.,]', '', price_text)
+        price_text = _NON_NUMERIC_RE.sub('', price_text)
 
         if not price_text:
             return None
@@ -323,7 +345,7 @@ class MarketDataCollector:
             return None
 
         # Remove non-digits except dots and commas
-        mileage_text = re.sub(r'[^\d.,]', '', mileage_text)
+        mileage_text = _NON_NUMERIC_RE.sub('', mileage_text)
         mileage_text = mileage_text.replace('.', '').replace(',', '')
 
         try:
@@ -13,7 +13,76 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from urllib.parse import urljoin
-from bs4 import BeautifulSoup
+from scrapers.helpers import load_search_page
+from bs4 import BeautifulSoup, SoupStrainer, NavigableString, Comment
+
+MAKE_MAPPING = {
+    'volkswagen': 'Volkswagen',
+    'opel': 'Opel',
+    'toyota': 'Toyota',
+    'ford': 'Ford',
+    'renault': 'Renault',
+    'kia': 'Kia',
+    'fiat': 'Fiat',
+    'suzuki': 'Suzuki',
+    'hyundai': 'Hyundai',
+    'citroen': 'Citroën',
+    'peugeot': 'Peugeot'
+}
+
+# Listings that are not cars for sale
+EXCLUDE_KEYWORDS = ('inkoop', 'gezocht', 'gevraagd', 'auctim', 'onderdelen', 'parts')
+_EXCLUDE_RE = re.compile('|'.join(map(re.escape, EXCLUDE_KEYWORDS)))
+
+CITIES = ('amsterdam', 'rotterdam', 'den haag', 'utrecht', 'eindhoven', 'tilburg', 'groningen')
+
+# Price, year and mileage in one alternation so a listing's text is scanned once
+_LISTING_RE = re.compile(
+    r'(?P<price>€\s*[0-9.,]+,-?)'
+    r'|\b(?P<year>20[0-2][0-9])\b'
+    r'|(?P<mileage>\d{1,3}(?:[.,]\d{3})*)\s*[kK][mM]'
+)
+_PRICE_EUR_RE = re.compile(r'€\s*([0-9.,]+),-?')
+_NON_NUMERIC_RE = re.compile(r'[^\d.,]')
+
+
+def _is_listing_class(value: Optional[str]) -> bool:
+    # The strainer sees the raw class attribute, e.g. "hz-Listing hz-Listing--list".
+    # Most tags on the page fail the substring test, so split only the rest.
+    return value is not None and 'hz-Listing' in value and 'hz-Listing' in value.split()
+
+
+# Only build the listing subtrees; the rest of the results page is never used
+_LISTING_STRAINER = SoupStrainer(class_=_is_listing_class)
+
+# Elements that start a new line in the rendered listing; text inside inline
+# elements such as <span> or <b> stays on the line around it
+_BLOCK_TAGS = frozenset((
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt',
+    'figcaption', 'figure', 'footer', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'header', 'li', 'ol', 'p', 'section', 'table', 'td', 'th', 'tr', 'ul',
+))
+
+
+def _listing_text(listing) -> str:
+    """The listing's text one line per block element, like Selenium's
+    WebElement.text, with whitespace inside a line collapsed"""
+    lines = []
+    current = []
+    current_block = None
+    for node in listing.descendants:
+        if not isinstance(node, NavigableString) or isinstance(node, Comment):
+            continue
+        block = node.parent
+        while block is not listing and block.name not in _BLOCK_TAGS:
+            block = block.parent
+        if block is not current_block:
+            lines.append(''.join(current))
+            current = []
+            current_block = block
+        current.append(node)
+    lines.append(''.join(current))
+    return '\n'.join(filter(None, (' '.join(line.split()) for line in lines)))
 
 class ProfitableCarScraper:
     def __init__(self, headless=True):
@@ -100,14 +169,23 @@ class ProfitableCarScraper:
 
         return base_url + query_params
 
+    def find_listings(self, limit: Optional[int] = None) -> List:
+        """Parse the current page once and return its listing elements.
+
+        Reading page_source is a single WebDriver call; working on the parsed
+        copy avoids a round trip for every listing.text / get_attribute access.
+        With a limit, matching stops after that many listings.
+        """
+        soup = BeautifulSoup(self.driver.page_source, 'lxml', parse_only=_LISTING_STRAINER)
+        return soup.select(".hz-Listing", limit=limit)
+
     def get_market_prices_by_year(self, brand: str, search_term: str, year: int, max_cars: int = 5) -> List[float]:
         """Get lowest prices for non-damaged cars of a specific year"""
         search_url = self.build_search_url(brand, search_term, year=year, with_damage=False)
         self.logger.info(f"Analyzing {year} market prices for {search_term}: {search_url}")
 
         try:
-            self.driver.get(search_url)
-            self.random_delay(3, 6)
+            load_search_page(self.driver, search_url, ".hz-Listing", self.logger)
 
             # Accept cookies if present
             try:
@@ -120,15 +198,15 @@ class ProfitableCarScraper:
                 pass
 
             # Find car listings
-            listings = self.driver.find_elements(By.CSS_SELECTOR, ".hz-Listing")
+            listings = self.find_listings(limit=max_cars)
             prices = []
 
-            for i, listing in enumerate(listings[:max_cars]):
+            for i, listing in enumerate(listings):
                 try:
-                    full_text = listing.text
+                    full_text = _listing_text(listing)
                     self.logger.debug(f"Listing {i+1} text: {full_text[:100]}...")
 
-                    price_match = re.search(r'€\s*([0-9.,]+),-?', full_text)
+                    price_match = _PRICE_EUR_RE.search(full_text)
                     if price_match:
                         price_text = price_match.group()
                         price = self.clean_price(price_text)
@@ -154,8 +232,11 @@ class ProfitableCarScraper:
             self.logger.error(f"Error getting market prices for {search_term} {year}: {e}")
             return []
 
-    def get_damaged_cars_by_year(self, brand: str, search_term: str, year: int, lowest_market_price: float) -> List[Dict]:
+    def get_damaged_cars_by_year(self, brand: str, search_term: str, year: int, lowest_market_price: float, seen_urls: Optional[set] = None) -> List[Dict]:
         """Get damaged cars of specific year and filter by profitability"""
+        if seen_urls is None:
+            seen_urls = set()
+
         # Calculate profit threshold (30% cheaper than lowest market price)
         profit_threshold = lowest_market_price * 0.7  # 30% cheaper
 
@@ -165,17 +246,26 @@ class ProfitableCarScraper:
         self.logger.info(f"Damaged car URL: {search_url}")
 
         try:
-            self.driver.get(search_url)
-            self.random_delay(3, 6)
+            load_search_page(self.driver, search_url, ".hz-Listing", self.logger)
 
             # Find car listings
-            listings = self.driver.find_elements(By.CSS_SELECTOR, ".hz-Listing")
+            listings = self.find_listings()
             profitable_cars = []
 
             for listing in listings:
                 try:
-                    car = self.extract_car_from_listing(listing, search_term)
-                    if car and car['price'] and car['year'] == year:  # Ensure year matches
+                    # Check the link first so a listing seen in an earlier
+                    # search skips the text extraction entirely
+                    url = self.listing_url(listing)
+                    if not url or url in seen_urls:
+                        continue
+
+                    car = self.extract_car_from_listing(listing, search_term, url)
+                    if not car:
+                        continue
+
+                    if car['price'] and car['year'] == year:  # Ensure year matches
+                        seen_urls.add(car['url'])
                         # Check if car is profitable (at least 30% cheaper than market)
                         if car['price'] <= profit_threshold:
                             profit_percentage = ((lowest_market_price - car['price']) / lowest_market_price) * 100
@@ -196,46 +286,57 @@ class ProfitableCarScraper:
             self.logger.error(f"Error getting damaged cars for {search_term} {year}: {e}")
             return []
 
-    def extract_car_from_listing(self, listing, model_name: str) -> Optional[Dict]:
-        """Extract car data from listing"""
+    def listing_url(self, listing) -> Optional[str]:
+        """Absolute Marktplaats URL of a listing's link, or None"""
+        link_elem = listing.find('a', href=True)
+        if not link_elem:
+            return None
+        url = urljoin("https://www.marktplaats.nl", link_elem['href'])
+        if 'marktplaats.nl' not in url:
+            return None
+        return url
+
+    def extract_car_from_listing(self, listing, model_name: str, url: Optional[str] = None) -> Optional[Dict]:
+        """Extract car data from listing. url is the listing's link when the
+        caller has already read it with listing_url."""
         try:
-            full_text = listing.text
+            full_text = _listing_text(listing)
             if not full_text or len(full_text) < 10:
                 return None
 
-            # Extract title
-            lines = full_text.split('\n')
-            title = lines[0] if lines else ""
+            # Extract title; listings put it in an <h3>, else use the first line
+            heading = listing.find('h3')
+            if heading:
+                title = ' '.join(heading.get_text(' ').split())
+            else:
+                title = full_text.partition('\n')[0]
 
             if not title or len(title) < 5:
                 return None
 
-            # Filter out unwanted listings
+            full_text_lower = full_text.lower()
             title_lower = title.lower()
-            exclude_keywords = ['inkoop', 'gezocht', 'gevraagd', 'auctim', 'onderdelen', 'parts']
-            if any(keyword in title_lower for keyword in exclude_keywords):
+
+            # Filter out unwanted listings
+            if _EXCLUDE_RE.search(title_lower):
                 return None
 
             # Get URL
-            try:
-                link_elem = listing.find_element(By.TAG_NAME, "a")
-                url = link_elem.get_attribute("href")
-                if not url or 'marktplaats.nl' not in url:
+            if url is None:
+                url = self.listing_url(listing)
+                if not url:
                     return None
-            except:
-                return None
 
-            # Extract price
-            price_match = re.search(r'€\s*([0-9.,]+),-?', full_text)
-            if not price_match:
+            # Extract price, year and mileage
+            price_text, year, mileage = self.scan_listing_text(full_text)
+            if not price_text:
                 return None
 
-            price = self.clean_price(price_match.group())
+            price = self.clean_price(price_text)
             if not price or price < 1500 or price > 7000:
                 return None
 
-            # Extract other details
-            make, model, year, mileage = self.parse_car_details(title, full_text, model_name)
+            make, model = self.parse_make_model(model_name)
 
             return {
                 'url': url,
@@ -247,7 +348,7 @@ class ProfitableCarScraper:
                 'model': model,
                 'year': year,
                 'mileage': mileage,
-                'location': self.extract_location(full_text),
+                'location': self.extract_location(full_text_lower),
                 'images': [],
                 'damage_keywords': ['schade'],  # We know it has damage since we searched for it
                 'has_cosmetic_damage_only': True,
@@ -265,7 +366,7 @@ class ProfitableCarScraper:
 
         # Remove currency symbols and dash
         price_text = str(price_text).replace("€", "").replace("EUR", "").replace(",-", "")
-        price_text = re.sub(r'[^\d.,]', '', price_text)
+        price_text = _NON_NUMERIC_RE.sub('', price_text)
 
         if not price_text:
             return None
@@ -294,27 +395,31 @@ class ProfitableCarScraper:
         except ValueError:
             return None
 
-    def parse_car_details(self, title: str, description: str, model_name: str) -> Tuple[str, str, Optional[int], Optional[int]]:
-        """Parse car make, model, year, and mileage"""
-        text = (title + " " + description).lower()
+    def scan_listing_text(self, text: str) -> Tuple[Optional[str], Optional[int], Optional[int]]:
+        """Find the first price text, year and mileage in a single pass"""
+        price_text = year = mileage = None
+
+        for match in _LISTING_RE.finditer(text):
+            if match.group('price'):
+                if price_text is None:
+                    price_text = match.group('price')
+            elif match.group('year'):
+                if year is None:
+                    year = int(match.group('year'))
+            elif mileage is None:
+                mileage_text = match.group('mileage').replace('.', '').replace(',', '')
+                mileage = int(mileage_text)
 
-        # Extract make from model_name
-        make_mapping = {
-            'volkswagen': 'Volkswagen',
-            'opel': 'Opel',
-            'toyota': 'Toyota',
-            'ford': 'Ford',
-            'renault': 'Renault',
-            'kia': 'Kia',
-            'fiat': 'Fiat',
-            'suzuki': 'Suzuki',
-            'hyundai': 'Hyundai',
-            'citroen': 'Citroën',
-            'peugeot': 'Peugeot'
-        }
+            if price_text and year and mileage is not None:
+                break
 
+        return price_text, year, mileage
+
+    def parse_make_model(self, model_name: str) -> Tuple[str, str]:
+        """Get car make and model from the search term"""
+        # Extract make from model_name
         make = None
-        for brand_key, brand_name in make_mapping.items():
+        for brand_key, brand_name in MAKE_MAPPING.items():
             if brand_key in model_name.lower():
                 make = brand_name
                 break
@@ -322,29 +427,11 @@ class ProfitableCarScraper:
         # Extract model from model_name
         model = model_name.split('+')[-1].title()  # Get last part and capitalize
 
-        # Extract year
-        year_match = re.search(r'\b(20[0-2][0-9])\b', text)
-        year = int(year_match.group(1)) if year_match else None
-
-        # Extract mileage
-        mileage_match = re.search(r'(\d{1,3}(?:[.,]\d{3})*)\s*km', text)
-        if mileage_match:
-            mileage_text = mileage_match.group(1).replace('.', '').replace(',', '')
-            try:
-                mileage = int(mileage_text)
-            except:
-                mileage = None
-        else:
-            mileage = None
-
-        return make, model, year, mileage
-
-    def extract_location(self, text: str) -> str:
-        """Extract location from text"""
-        cities = ['amsterdam', 'rotterdam', 'den haag', 'utrecht', 'eindhoven', 'tilburg', 'groningen']
-        text_lower = text.lower()
+        return make, model
 
-        for city in cities:
+    def extract_location(self, text_lower: str) -> str:
+        """Extract location from lowercased text"""
+        for city in CITIES:
             if city in text_lower:
                 return city.title()
         return ""
@@ -352,6 +439,7 @@ class ProfitableCarScraper:
     def scrape_profitable_cars(self, max_results: int = 50) -> List[Dict]:
         """Main method to scrape profitable damaged cars year by year"""
         all_profitable_cars = []
+        seen_urls = set()  # Overlapping model searches can return the same listing
 
         for model_data in self.target_models:
             if len(all_profitable_cars) >= max_results:
@@ -377,7 +465,7 @@ class ProfitableCarScraper:
                     lowest_market_price = min(market_prices)
 
                     # Step 2: Find profitable damaged cars for this year
-                    damaged_cars = self.get_damaged_cars_by_year(brand, search_term, year, lowest_market_price)
+                    damaged_cars = self.get_damaged_cars_by_year(brand, search_term, year, lowest_market_price, seen_urls)
                     all_profitable_cars.extend(damaged_cars)
 
                     if damaged_cars:
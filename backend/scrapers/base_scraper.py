@@ -1,33 +1,111 @@
 import asyncio
-import aiohttp
+import ahocorasick
+import httpx
 import time
 import random
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+from urllib.parse import urljoin
+from decouple import config
 from fake_useragent import UserAgent
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 import logging
 
+# Warm Chrome instances kept per Selenium scraper. Each is a full browser
+# process, so keep this low on small containers.
+BROWSER_POOL_SIZE = config("BROWSER_POOL_SIZE", default=1, cast=int)
+
+# Deletion tables for the clean_* helpers. Text is first reduced to ASCII so the
+# tables only need to cover 128 code points and translate() stays a C-level loop.
+_PRICE_DELETE = str.maketrans('', '', ''.join(chr(c) for c in range(128) if not (chr(c).isdigit() or chr(c) == '.')))
+_DIGITS_DELETE = str.maketrans('', '', ''.join(chr(c) for c in range(128) if not chr(c).isdigit()))
+
+# Used by _wait_for_render. Scrolls to the bottom and returns how many elements match the selector
+_SCROLL_AND_COUNT_JS = (
+    "window.scrollTo(0, document.body.scrollHeight);"
+    " return document.querySelectorAll(arguments[0]).length;"
+)
+_SERIALIZE_JS = "document.documentElement.outerHTML"
+# How long lazy-loaded content gets to appear after scrolling
+_LAZY_LOAD_SETTLE_TIMEOUT = 2
+_LAZY_LOAD_POLL_INTERVAL = 0.25
+
+
+def _ascii(text: str) -> str:
+    return text.encode('ascii', 'ignore').decode('ascii')
+
+
+def _is_word_char(text: str, index: int) -> bool:
+    """Whether text[index] exists and is a regex \\w character"""
+    return 0 <= index < len(text) and (text[index].isalnum() or text[index] == '_')
+
+
+def build_make_automaton(make_keys) -> ahocorasick.Automaton:
+    """Automaton that finds every lowercased make key in a text with one scan"""
+    automaton = ahocorasick.Automaton()
+    for key in make_keys:
+        automaton.add_word(key, (len(key), key))
+    automaton.make_automaton()
+    return automaton
+
+
+def find_make(automaton: ahocorasick.Automaton, text: str) -> Optional[Tuple[str, int, int]]:
+    """The make key mentioned first in a lowercased text as (key, start, end),
+    or None. Only whole words count, so 'mini' does not match 'minimale'; on
+    a tie the longer key wins, so 'mercedes-benz' beats 'mercedes'."""
+    found = None
+    for last, (length, key) in automaton.iter(text):
+        start = last - length + 1
+        if _is_word_char(text, start - 1) or _is_word_char(text, last + 1):
+            continue
+        if found is None or start < found[1] or (start == found[1] and length > len(found[0])):
+            found = (key, start, last + 1)
+    return found
+
+
+def join_url(origin: str, href: str) -> str:
+    """urljoin against a scheme://host origin, skipping URL parsing for the
+    root-relative and absolute hrefs the scraped sites actually use"""
+    if href.startswith('/') and not href.startswith('//'):
+        return origin + href
+    if href.startswith(('https://', 'http://')):
+        return href
+    return urljoin(origin, href)
+
+
 class BaseScraper(ABC):
     def __init__(self, delay_range=(2, 5), use_selenium=True):
         self.delay_range = delay_range
         self.use_selenium = use_selenium
         self.user_agent = UserAgent()
         self.session = None
-        self.driver = None
+        self._driver_pool: Optional[asyncio.Queue] = None
+        # Drivers discarded by cancelled callers and not yet replaced
+        self._pool_shortfall = 0
         self.logger = logging.getLogger(self.__class__.__name__)
 
     async def setup(self):
         if self.use_selenium:
             await self._setup_selenium()
-        else:
-            await self._setup_session()
+        # Plain HTTP is also used next to the browser for JSON APIs and static pages
+        await self._setup_session()
 
     async def _setup_selenium(self):
+        # Start the browsers side by side; each start blocks for a few seconds
+        drivers = await asyncio.gather(*(
+            asyncio.to_thread(self._create_driver) for _ in range(BROWSER_POOL_SIZE)
+        ))
+        self._driver_pool = asyncio.Queue()
+        for driver in drivers:
+            self._driver_pool.put_nowait(driver)
+
+    def _create_driver(self) -> webdriver.Chrome:
         chrome_options = Options()
         chrome_options.add_argument("--headless")
         chrome_options.add_argument("--no-sandbox")
@@ -46,49 +124,137 @@ class BaseScraper(ABC):
         chrome_options.binary_location = "/usr/bin/chromium"
 
         try:
-            self.driver = webdriver.Chrome(
+            driver = webdriver.Chrome(
                 service=webdriver.chrome.service.Service("/usr/bin/chromedriver"),
                 options=chrome_options
             )
-            self.driver.set_page_load_timeout(30)
+            driver.set_page_load_timeout(30)
+            return driver
         except Exception as e:
             self.logger.error(f"Failed to initialize Chrome driver: {e}")
             raise
 
-    async def restart_browser(self):
-        """Restart the browser to free memory"""
+    @staticmethod
+    def _quit_driver(driver: webdriver.Chrome):
+        try:
+            driver.quit()
+        except:
+            pass
+
+    async def _recycle_driver(self, driver: webdriver.Chrome) -> webdriver.Chrome:
+        """Replace a driver that errored with a fresh one. If Chrome cannot be
+        started the old driver is kept, so the pool never shrinks."""
+        try:
+            new_driver = await asyncio.to_thread(self._create_driver)
+        except Exception:
+            return driver
+        await asyncio.to_thread(self._quit_driver, driver)
+        return new_driver
+
+    async def _refill_pool(self):
+        """Start replacements for drivers discarded by cancelled callers. A
+        failed start is retried on the next borrow, and only raised when the
+        pool is empty, since the borrow would otherwise wait forever."""
+        while self._pool_shortfall:
+            self._pool_shortfall -= 1
+            try:
+                driver = await asyncio.to_thread(self._create_driver)
+            except Exception:
+                self._pool_shortfall += 1
+                if self._driver_pool.empty():
+                    raise
+                return
+            self._driver_pool.put_nowait(driver)
+
+    @asynccontextmanager
+    async def _pooled_driver(self) -> AsyncIterator[webdriver.Chrome]:
+        """Borrow a warm driver from the pool, recycling it if the caller fails.
+        A cancelled caller's worker thread may still be driving the browser,
+        so that driver is quit and never goes back to the pool; the pool is
+        refilled on a later borrow."""
+        if self._pool_shortfall:
+            await self._refill_pool()
+        driver = await self._driver_pool.get()
+        try:
+            yield driver
+        except Exception:
+            driver = await self._recycle_driver(driver)
+            raise
+        except BaseException:
+            self._pool_shortfall += 1
+            busy, driver = driver, None
+            await asyncio.to_thread(self._quit_driver, busy)
+            raise
+        finally:
+            if driver is not None:
+                self._driver_pool.put_nowait(driver)
+
+    async def restart_browser(self) -> int:
+        """Replace every idle pooled browser to free memory and return how many
+        were replaced; browsers checked out by other tasks are left alone. A
+        browser whose replacement fails to start is kept, so the pool never
+        shrinks and tasks waiting in _pooled_driver still get a driver; the
+        failure is re-raised."""
         self.logger.info("Restarting browser to free memory...")
-        if self.driver:
+        idle = []
+        while not self._driver_pool.empty():
+            idle.append(self._driver_pool.get_nowait())
+        failure = None
+        replaced = 0
+        # One at a time, so at most one extra Chrome is running during the swap
+        for driver in idle:
             try:
-                self.driver.quit()
+                new_driver = await asyncio.to_thread(self._create_driver)
+            except Exception as e:
+                failure = e
+                self._driver_pool.put_nowait(driver)
+                continue
+            try:
+                driver.quit()
             except:
                 pass
-            self.driver = None
-        await self._setup_selenium()
+            self._driver_pool.put_nowait(new_driver)
+            replaced += 1
+        if failure:
+            raise failure
+        return replaced
 
     async def _setup_session(self):
         headers = {
             'User-Agent': self.user_agent.random,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'nl-NL,nl;q=0.8,en-US;q=0.5,en;q=0.3',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
+            'Accept-Encoding': 'gzip, deflate, br',
             'Upgrade-Insecure-Requests': '1',
         }
-        self.session = aiohttp.ClientSession(headers=headers)
+        # HTTP/2 lets concurrent page fetches share one connection per host
+        self.session = httpx.AsyncClient(
+            http2=True,
+            headers=headers,
+            timeout=15.0,
+            follow_redirects=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        )
 
     async def close(self):
-        if self.driver:
-            self.driver.quit()
+        if self._driver_pool:
+            while not self._driver_pool.empty():
+                try:
+                    self._driver_pool.get_nowait().quit()
+                except:
+                    pass
         if self.session:
-            await self.session.close()
+            await self.session.aclose()
 
     async def random_delay(self):
         delay = random.uniform(*self.delay_range)
         await asyncio.sleep(delay)
 
-    async def get_page(self, url: str) -> str:
-        await self.random_delay()
+    async def get_page(self, url: str, delay: bool = True) -> str:
+        """Fetch url, waiting a random delay first unless delay=False because
+        the caller already waited before this request"""
+        if delay:
+            await self.random_delay()
 
         if self.use_selenium:
             return await self._get_page_selenium(url)
@@ -96,26 +262,93 @@ class BaseScraper(ABC):
             return await self._get_page_session(url)
 
     async def _get_page_selenium(self, url: str) -> str:
-        try:
-            self.driver.get(url)
-            WebDriverWait(self.driver, 10).until(
+        def load_page(driver):
+            driver.get(url)
+            WebDriverWait(driver, 10).until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
-            return self.driver.page_source
+            return driver.page_source
+
+        try:
+            # WebDriver calls block; run them off the event loop
+            async with self._pooled_driver() as driver:
+                return await asyncio.to_thread(load_page, driver)
         except Exception as e:
             self.logger.error(f"Error getting page with Selenium: {e}")
             return ""
 
+    async def render_page(self, url: str, css_selector: str, timeout: int = 10, delay: bool = True) -> str:
+        """Load url and return its HTML once an element matching css_selector
+        is present. With Selenium the page is only serialized after it has
+        rendered, instead of once on load and again after the wait. Pass
+        delay=False when the caller already waited before this request."""
+        if not self.use_selenium:
+            return await self.get_page(url)
+
+        if delay:
+            await self.random_delay()
+
+        def load_and_render(driver):
+            # A change to the #fragment alone does not reload the page
+            if driver.current_url.partition('#')[0] == url.partition('#')[0]:
+                driver.get("about:blank")
+            driver.get(url)
+            return self._wait_for_render(driver, css_selector, timeout)
+
+        try:
+            async with self._pooled_driver() as driver:
+                return await asyncio.to_thread(load_and_render, driver)
+        except Exception as e:
+            self.logger.error(f"Error rendering page with Selenium: {e}")
+            return ""
+
+    def _wait_for_render(self, driver: webdriver.Chrome, css_selector: str, timeout: int = 10) -> str:
+        """Block until an element matching css_selector is present, scroll to the
+        bottom to trigger lazy-loaded content, wait for the number of matches
+        to stop changing and return the page source."""
+        try:
+            WebDriverWait(driver, timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, css_selector))
+            )
+        except TimeoutException:
+            self.logger.warning(f"Timed out waiting for '{css_selector}' to render")
+        else:
+            # Lazy-loaded listings arrive after the scroll, so keep scrolling
+            # until a poll finds the same count as the one before it
+            last_count = None
+
+            def settled(d):
+                nonlocal last_count
+                count = d.execute_script(_SCROLL_AND_COUNT_JS, css_selector)
+                if count == last_count:
+                    return True
+                last_count = count
+                return False
+
+            try:
+                WebDriverWait(
+                    driver, _LAZY_LOAD_SETTLE_TIMEOUT, poll_frequency=_LAZY_LOAD_POLL_INTERVAL
+                ).until(settled)
+            except TimeoutException:
+                self.logger.debug(f"'{css_selector}' was still growing after scrolling")
+
+        # Serialize through DevTools: one call, and no re-encoding of page_source
+        result = driver.execute_cdp_cmd('Runtime.evaluate', {
+            'expression': _SERIALIZE_JS,
+            'returnByValue': True,
+        })
+        return result['result']['value']
+
     async def _get_page_session(self, url: str) -> str:
         try:
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    return await response.text()
-                else:
-                    self.logger.error(f"HTTP {response.status} for URL: {url}")
-                    return ""
+            response = await self.session.get(url)
+            if response.status_code == 200:
+                return response.text
+            else:
+                self.logger.error(f"HTTP {response.status_code} for URL: {url}")
+                return ""
         except Exception as e:
-            self.logger.error(f"Error getting page with aiohttp: {e}")
+            self.logger.error(f"Error getting page with httpx: {e}")
             return ""
 
     @abstractmethod
@@ -134,8 +367,8 @@ class BaseScraper(ABC):
         if not price_text:
             return None
 
-        price_text = price_text.replace("€", "").replace(".", "").replace(",", ".")
-        price_text = ''.join(filter(lambda x: x.isdigit() or x == '.', price_text))
+        price_text = price_text.replace(".", "").replace(",", ".")
+        price_text = _ascii(price_text).translate(_PRICE_DELETE)
 
         try:
             return float(price_text)
@@ -146,8 +379,7 @@ class BaseScraper(ABC):
         if not mileage_text:
             return None
 
-        mileage_text = mileage_text.replace("km", "").replace(".", "").replace(",", "")
-        mileage_text = ''.join(filter(str.isdigit, mileage_text))
+        mileage_text = _ascii(mileage_text).translate(_DIGITS_DELETE)
 
         try:
             return int(mileage_text)
@@ -158,7 +390,7 @@ class BaseScraper(ABC):
         if not year_text:
             return None
 
-        year_text = ''.join(filter(str.isdigit, year_text))
+        year_text = _ascii(year_text).translate(_DIGITS_DELETE)
 
         try:
             year = int(year_text)
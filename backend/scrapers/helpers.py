@@ -0,0 +1,29 @@
+"""Helpers shared by the async scrapers in this package and the synchronous
+Selenium scrapers in backend/"""
+import logging
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+# Folds accented letters to ASCII so each make needs only its plain spelling
+FOLD_ACCENTS = str.maketrans('àáâäãåèéêëìíîïòóôöõùúûüýÿñçš', 'aaaaaaeeeeiiiiooooouuuuyyncs')
+
+
+def load_search_page(driver: webdriver.Chrome, url: str, css_selector: str, logger: logging.Logger, timeout: int = 10):
+    """Open a results page and return as soon as an element matching
+    css_selector is present, instead of sleeping for a fixed time. Gives up
+    quietly after timeout, since a search can legitimately have no results."""
+    # A change to the #fragment alone does not reload the page, and the
+    # previous results would then be read back immediately
+    if driver.current_url.partition('#')[0] == url.partition('#')[0]:
+        driver.get("about:blank")
+    driver.get(url)
+    try:
+        WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, css_selector))
+        )
+    except TimeoutException:
+        logger.info(f"No listings rendered within {timeout}s")
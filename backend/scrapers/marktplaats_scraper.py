@@ -1,249 +1,567 @@
+import os
 import re
+import json
 import time
+import heapq
 import asyncio
 import statistics
+import tempfile
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict, Optional
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
-from .base_scraper import BaseScraper
+from types import MappingProxyType
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+from lxml import etree, html as lxml_html
+from decouple import config
+from .base_scraper import BaseScraper, build_make_automaton, find_make, join_url
+from .helpers import FOLD_ACCENTS
 import logging
 
 # Year range to search
 MIN_YEAR = 2014
 MAX_YEAR = 2019
 
+CAR_MAKES = MappingProxyType({
+    'volkswagen': 'Volkswagen', 'vw': 'Volkswagen', 'audi': 'Audi',
+    'bmw': 'BMW', 'mercedes': 'Mercedes-Benz', 'opel': 'Opel',
+    'ford': 'Ford', 'renault': 'Renault', 'peugeot': 'Peugeot',
+    'citroen': 'Citroën', 'toyota': 'Toyota',
+    'nissan': 'Nissan', 'honda': 'Honda', 'mazda': 'Mazda',
+    'hyundai': 'Hyundai', 'kia': 'Kia', 'volvo': 'Volvo',
+    'seat': 'SEAT', 'skoda': 'Škoda', 'fiat': 'Fiat',
+    'alfa romeo': 'Alfa Romeo', 'mini': 'MINI', 'smart': 'Smart',
+    'dacia': 'Dacia', 'suzuki': 'Suzuki', 'mitsubishi': 'Mitsubishi',
+    'porsche': 'Porsche', 'tesla': 'Tesla',
+})
+
+# Words that can follow a make but are not a model name
+_MODEL_STOPWORDS = frozenset({'schade', 'met', 'auto', 'te', 'koop', 'de'})
+
+# Finds every make key in a title with one scan
+_MAKES_AC = build_make_automaton(CAR_MAKES)
+
+# Present once the search results have rendered
+_LISTING_CSS = "[class*='Listing'], a[href*='/v/auto-s/']"
+
+# Every candidate listing element, collected in a single walk of the document;
+# _LISTING_PRIORITY then decides which kind of element the page is using
+_LISTING_XPATH = etree.XPath(
+    "//*[((self::article or self::li or self::div) and contains(@class, 'Listing'))"
+    " or (self::a and contains(@href, '/v/auto-s/'))]"
+)
+# Listing container tags from most to least specific; only the first tag the
+# page has is used. An <a> can only have matched on its href.
+_LISTING_PRIORITY = {'article': 0, 'li': 1, 'div': 2, 'a': 3}
+# Every element a listing preview field can come from, in document order, so
+# each listing's subtree is walked once instead of once per field
+_PREVIEW_XPATH = etree.XPath(
+    ".//a[@href] | .//h3 | .//h2 | .//h4 | .//img"
+    " | .//*[contains(@class, 'title') or contains(@class, 'Title')"
+    " or contains(@class, 'name') or contains(@class, 'Name')"
+    " or contains(@class, 'price') or contains(@class, 'Price') or contains(@class, 'prijs')"
+    " or contains(@class, 'location') or contains(@class, 'Location')]"
+)
+# Title preview sources, in order of preference
+_TITLE_FIELDS = ('h3', 'h2', 'h4', 'title')
+
+
+def _preview_fields(listing) -> Dict[str, object]:
+    """Map each preview field to the first element in the listing providing it"""
+    fields = {}
+    for element in _PREVIEW_XPATH(listing):
+        tag = element.tag
+        if tag in ('h3', 'h2', 'h4', 'img') or (tag == 'a' and element.get('href') is not None):
+            fields.setdefault(tag, element)
+        css_class = element.get('class')
+        if css_class:
+            if 'title' in css_class or 'Title' in css_class or 'name' in css_class or 'Name' in css_class:
+                fields.setdefault('title', element)
+            if 'price' in css_class or 'Price' in css_class or 'prijs' in css_class:
+                fields.setdefault('price', element)
+            if 'location' in css_class or 'Location' in css_class:
+                fields.setdefault('location', element)
+    return fields
+
+
+# Patterns used per listing, compiled once
+_PRICE_EUR_RE = re.compile(r'€\s*([\d.,]+)')
+# Year and mileage in one alternation so a title is scanned once for both
+_YEAR_MILEAGE_RE = re.compile(
+    r'\b(?P<year>20[0-2]\d|19[89]\d)\b'
+    r'|(?P<mileage>\d{1,3}(?:[.,]\d{3})*)\s*km'
+)
+# First word after the make; matched from the make's end offset
+_MODEL_RE = re.compile(r'\s*([a-z0-9\-]+)')
+
+
+# JSON search endpoint behind the Marktplaats results page; category 91 is "Auto's"
+_SEARCH_API_URL = "https://www.marktplaats.nl/lrp/api/search"
+_SEARCH_API_LIMIT = 30
+# (term, year) searches in flight at once; rendered ones wait for a pooled browser
+_SEARCH_CONCURRENCY = 5
+
+# Medians from earlier runs, per (term, year), used when a search returns too
+# few prices to compute its own. Entries expire after a day; a search that
+# found no deals this many runs in a row is skipped until its entry expires.
+# The default lives in backend/ so every process shares one file, whatever
+# directory it was started from.
+MEDIAN_CACHE_PATH = config(
+    "MEDIAN_CACHE_PATH",
+    default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "median_cache.json"),
+)
+_MEDIAN_CACHE_TTL = 24 * 60 * 60
+_MEDIAN_CACHE_SKIP_AFTER = 3
+
+
+@dataclass(slots=True)
+class CarCandidate:
+    """One search result, before it is priced against the median"""
+    url: str
+    title: str
+    price: Optional[float]
+    image_url: Optional[str]
+    location: str
+
+
+@lru_cache(maxsize=4096)
+def _parse_details_cached(
+    text_lower: str, search_term: str
+) -> Tuple[Optional[str], Optional[str], Optional[int], Optional[str]]:
+    """Make, model, year and raw mileage text from a lowercased, accent-folded
+    title and search term. Reposted listings repeat the same title across
+    searches, so results are cached."""
+    found = find_make(_MAKES_AC, text_lower)
+    make = CAR_MAKES[found[0]] if found else None
+
+    year = None
+    mileage_text = None
+    for match in _YEAR_MILEAGE_RE.finditer(text_lower):
+        if match.lastgroup == 'year':
+            if year is None:
+                year = int(match.group('year'))
+        elif mileage_text is None:
+            mileage_text = match.group('mileage')
+        if year is not None and mileage_text is not None:
+            break
+
+    # Extract model from text (word after make name)
+    model = None
+    if found:
+        model_match = _MODEL_RE.match(text_lower, found[2])
+        if model_match:
+            candidate = model_match.group(1)
+            if candidate not in _MODEL_STOPWORDS:
+                model = candidate.title()
+
+    # Fallback: extract model from search term
+    if not model and search_term:
+        for key in CAR_MAKES:
+            if search_term.startswith(key):
+                remainder = search_term[len(key):].strip()
+                if remainder:
+                    model = remainder.split()[0].title()
+                break
+
+    return make, model, year, mileage_text
+
 
 class MarktplaatsScraper(BaseScraper):
     def __init__(self):
         super().__init__(use_selenium=True)
         self.base_url = "https://www.marktplaats.nl"
+        self.api_blocked = False
+        self._median_cache = self._load_median_cache()
 
     async def scrape_search_results(self, search_terms: List[str], max_pages: int = 3, on_car_found=None, on_progress=None, website_name: str = 'marktplaats.nl') -> List[Dict]:
-        all_cars = []
-        seen_urls = set()
+        # Every listing URL seen this run, mapped to its car if it was a deal.
+        # One dict does both the dedup and the collecting, in arrival order.
+        cars_by_url: Dict[str, Optional[Dict]] = {}
         consecutive_crashes = 0
         search_count = 0
         backoff_seconds = 0
+        browser_failed = False
+        # Searches render concurrently: the crash/backoff state above is only
+        # changed under this lock, and browser_restarts tells a failure on the
+        # old browsers apart from one on the restarted ones
+        crash_lock = asyncio.Lock()
+        browser_restarts = 0
         total_searches = len(search_terms) * (MAX_YEAR - MIN_YEAR + 1)
-
-        for term in search_terms:
-            for year in range(MIN_YEAR, MAX_YEAR + 1):
-                search_count += 1
-                self.logger.info(f"[{search_count}] Searching: {term} ({year})")
-                if on_progress:
-                    on_progress(search_count, total_searches, f"{term} ({year})", website_name)
-
-                # Restart browser every 10 searches to prevent memory crashes
-                if search_count > 1 and search_count % 10 == 0:
-                    try:
-                        await self.restart_browser()
-                        consecutive_crashes = 0
-                    except Exception as e:
-                        self.logger.error(f"Failed to restart browser: {e}")
-                        break
-
-                search_url = (
-                    f"{self.base_url}/l/auto-s/"
-                    f"#q:{term.replace(' ', '+')}"
-                    f"|constructionYearFrom:{year}"
-                    f"|constructionYearTo:{year}"
-                    f"|mileageTo:180001"
-                )
-
-                # Navigate away first to force full reload (hash-only changes don't reload)
-                if self.driver:
-                    try:
-                        self.driver.get("about:blank")
-                        time.sleep(0.5)
-                    except Exception:
-                        pass
-
-                if backoff_seconds > 0:
-                    self.logger.info(f"Backing off {backoff_seconds}s before next request...")
-                    await asyncio.sleep(backoff_seconds)
-
-                html = await self.get_page(search_url)
-                if not html:
-                    self.logger.warning(f"No HTML returned for: {term} ({year})")
+        semaphore = asyncio.Semaphore(_SEARCH_CONCURRENCY)
+
+        async def render_search(term: str, year: int, delay: bool = True) -> Optional[List[CarCandidate]]:
+            """Browser fallback for one search; None when the page did not load.
+            delay=False skips the random delay when the API attempt already waited."""
+            nonlocal consecutive_crashes, backoff_seconds, browser_failed, browser_restarts
+
+            search_url = (
+                f"{self.base_url}/l/auto-s/"
+                f"#q:{term.replace(' ', '+')}"
+                f"|constructionYearFrom:{year}"
+                f"|constructionYearTo:{year}"
+                f"|mileageTo:180001"
+            )
+
+            if backoff_seconds > 0:
+                self.logger.info(f"Backing off {backoff_seconds}s before next request...")
+                await asyncio.sleep(backoff_seconds)
+
+            restarts_before = browser_restarts
+            html = await self.render_page(search_url, _LISTING_CSS, delay=delay)
+            async with crash_lock:
+                if browser_restarts != restarts_before:
+                    # Rendered on a browser that has since been replaced; its
+                    # outcome says nothing about the new ones
+                    pass
+                elif not html:
                     consecutive_crashes += 1
                     backoff_seconds = min(60, 10 * consecutive_crashes)
-                    if consecutive_crashes >= 3:
+                    if consecutive_crashes >= 3 and not browser_failed:
+                        # Holding the lock keeps other searches from restarting
+                        # too, or counting their crashes against the new browser
                         self.logger.warning("3 consecutive crashes, restarting browser...")
                         try:
-                            await self.restart_browser()
-                            consecutive_crashes = 0
-                            backoff_seconds = 60  # Long pause after browser restart
+                            replaced = await self.restart_browser()
                         except Exception as e:
                             self.logger.error(f"Failed to restart browser: {e}")
-                            break
+                            browser_failed = True
+                        else:
+                            if replaced:
+                                browser_restarts += 1
+                                consecutive_crashes = 0
+                                backoff_seconds = 60  # Long pause after browser restart
+                            else:
+                                # Every browser is busy with another search; the
+                                # next crash tries again
+                                self.logger.warning("No idle browser to restart")
+                else:
+                    consecutive_crashes = 0
+                    backoff_seconds = 0
+
+            if not html:
+                self.logger.warning(f"No HTML returned for: {term} ({year})")
+                return None
+
+            # Extract all car listings from search results. lxml drops the GIL
+            # while parsing, so other searches keep running meanwhile.
+            return await asyncio.to_thread(self._extract_car_urls, html, self.base_url)
+
+        async def scrape_one(term: str, year: int):
+            nonlocal search_count
+
+            search_count += 1
+            self.logger.info(f"[{search_count}] Searching: {term} ({year})")
+            if on_progress:
+                on_progress(search_count, total_searches, f"{term} ({year})", website_name)
+
+            cached = self._median_cache.get((term, year))
+            if cached and cached.get('empty_runs', 0) >= _MEDIAN_CACHE_SKIP_AFTER:
+                self.logger.info(f"No deals for '{term}' ({year}) in {cached['empty_runs']} runs, skipping")
+                return
+
+            # Prefer the JSON API; only render the page when it is unavailable.
+            # _search_api only waits before a request it actually sends.
+            api_tried = not self.api_blocked and self.session is not None
+            candidates = await self._search_api(term, year)
+            if candidates is None:
+                if browser_failed:
+                    return
+                candidates = await render_search(term, year, delay=not api_tried)
+                if candidates is None:
+                    return
+            self.logger.info(f"Found {len(candidates)} listings for '{term}' ({year})")
+
+            # Median of the 7 cheapest valid prices (> €500); nsmallest keeps only
+            # those 7 while streaming, rather than sorting every price
+            cheapest_7 = heapq.nsmallest(
+                7, (c.price for c in candidates if c.price and c.price > 500)
+            )
+
+            if len(cheapest_7) >= 3:
+                median_price = statistics.median(cheapest_7)
+                cached = {'median': median_price, 'updated': time.time(),
+                          'empty_runs': cached.get('empty_runs', 0) if cached else 0}
+            elif cached and cheapest_7:
+                # Too few prices today; fall back to the median of a recent run.
+                # Without a single valid price there is nothing to compare.
+                median_price = cached['median']
+            else:
+                self.logger.warning(f"Not enough prices ({len(cheapest_7)}) for '{term}' ({year}), skipping")
+                return
+            deals_found = 0
+
+            threshold = median_price * 0.70  # 30% below median
+            self.logger.info(f"Median for '{term}' ({year}): €{median_price:.0f}, threshold: €{threshold:.0f}")
+
+            # Only keep cars priced ≥30% below median
+            for candidate in candidates:
+                url = candidate.url
+                price = candidate.price
+
+                if not url or url in cars_by_url:
                     continue
+                cars_by_url[url] = None
 
-                consecutive_crashes = 0
-                backoff_seconds = 0
+                if not price or price <= 500:
+                    continue
 
-                # Wait for JS to render listings
-                if self.driver:
-                    try:
-                        time.sleep(3)
-                        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                        time.sleep(2)
-                        html = self.driver.page_source
-                    except Exception as e:
-                        self.logger.error(f"Error during page interaction: {e}")
+                if price > threshold:
+                    continue
 
-                # Extract all car listings from search results
-                candidates = self._extract_car_urls(html, self.base_url)
-                self.logger.info(f"Found {len(candidates)} listings for '{term}' ({year})")
+                profit_percentage = ((median_price - price) / median_price) * 100
 
-                # Collect valid prices (> €500), sort low to high, take median of 7 cheapest
-                valid_prices = sorted([c['price'] for c in candidates if c.get('price') and c['price'] > 500])
+                if profit_percentage >= 50:
+                    deal_rating = "excellent"
+                elif profit_percentage >= 30:
+                    deal_rating = "good"
+                else:
+                    deal_rating = "fair"
 
-                if len(valid_prices) < 3:
-                    self.logger.warning(f"Not enough prices ({len(valid_prices)}) for '{term}' ({year}), skipping")
-                    continue
+                make, model_name, parsed_year, mileage = self._parse_car_details(
+                    candidate.title, term
+                )
 
-                cheapest_7 = valid_prices[:7]
-                median_price = statistics.median(cheapest_7)
-                threshold = median_price * 0.70  # 30% below median
-                self.logger.info(f"Median for '{term}' ({year}): €{median_price:.0f}, threshold: €{threshold:.0f}")
+                images = []
+                if candidate.image_url:
+                    images.append(candidate.image_url)
 
-                # Only keep cars priced ≥30% below median
-                for candidate in candidates:
-                    url = candidate.get('url')
-                    price = candidate.get('price')
+                car = {
+                    'url': url,
+                    'source_website': 'marktplaats.nl',
+                    'title': candidate.title,
+                    'description': '',
+                    'price': price,
+                    'make': make,
+                    'model': model_name,
+                    'year': parsed_year or year,
+                    'mileage': mileage,
+                    'location': candidate.location,
+                    'images': images,
+                    'damage_keywords': [],
+                    'has_cosmetic_damage_only': True,
+                    'market_price': median_price,
+                    'profit_percentage': round(profit_percentage, 1),
+                    'deal_rating': deal_rating,
+                }
+
+                self.logger.info(
+                    f"Deal: {candidate.title[:50]} | "
+                    f"€{price:.0f} vs median €{median_price:.0f} ({year}) | "
+                    f"{profit_percentage:.0f}% below | {deal_rating}"
+                )
+                cars_by_url[url] = car
+                deals_found += 1
+                if on_car_found:
+                    await on_car_found(car)
+
+            cached['empty_runs'] = 0 if deals_found else cached.get('empty_runs', 0) + 1
+            self._median_cache[(term, year)] = cached
+
+        async def scrape_one_bounded(term: str, year: int):
+            async with semaphore:
+                # A failure must not reach gather: it would return while the
+                # other searches still hold pooled browsers, and the caller
+                # would close the scraper under them
+                try:
+                    await scrape_one(term, year)
+                except Exception as e:
+                    self.logger.error(f"Error searching '{term}' ({year}): {e}")
+
+        await asyncio.gather(*(
+            scrape_one_bounded(term, year)
+            for term in search_terms
+            for year in range(MIN_YEAR, MAX_YEAR + 1)
+        ))
+
+        self._save_median_cache()
+
+        self.logger.debug(f"Title parse cache: {_parse_details_cached.cache_info()}")
+        # Titles rarely repeat between runs; don't let the cache outlive one
+        _parse_details_cached.cache_clear()
+
+        all_cars = [car for car in cars_by_url.values() if car is not None]
+        self.logger.info(f"Total below-market cars from Marktplaats: {len(all_cars)}")
+        return all_cars
 
-                    if not url or url in seen_urls:
-                        continue
-                    seen_urls.add(url)
+    def _load_median_cache(self) -> Dict[Tuple[str, int], Dict]:
+        """Read the unexpired entries of the median cache file"""
+        try:
+            with open(MEDIAN_CACHE_PATH, encoding='utf-8') as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable median cache {MEDIAN_CACHE_PATH}: {e}")
+            return {}
+
+        if not isinstance(entries, dict):
+            self.logger.warning(f"Ignoring median cache {MEDIAN_CACHE_PATH}: not a JSON object")
+            return {}
+
+        cutoff = time.time() - _MEDIAN_CACHE_TTL
+        cache = {}
+        for key, entry in entries.items():
+            # A hand-edited or foreign file can hold anything; skip what doesn't parse
+            try:
+                term, _, year = key.rpartition('|')
+                if entry.get('updated', 0) >= cutoff:
+                    cache[(term, int(year))] = {
+                        **entry,
+                        'median': float(entry['median']),
+                        'empty_runs': int(entry.get('empty_runs', 0)),
+                    }
+            except (ValueError, TypeError, AttributeError, KeyError):
+                self.logger.warning(f"Ignoring malformed median cache entry {key!r}")
+        return cache
+
+    def _save_median_cache(self):
+        """Write the median cache back, keyed "term|year" for JSON. The file is
+        written next to the old one and swapped in, so a crash mid-write
+        leaves the previous cache intact."""
+        entries = {f"{term}|{year}": entry for (term, year), entry in self._median_cache.items()}
+        tmp_path = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                'w', encoding='utf-8', dir=os.path.dirname(MEDIAN_CACHE_PATH) or '.',
+                prefix='.median_cache-', suffix='.tmp', delete=False,
+            ) as f:
+                tmp_path = f.name
+                json.dump(entries, f)
+            os.replace(tmp_path, MEDIAN_CACHE_PATH)
+        except OSError as e:
+            self.logger.warning(f"Could not write median cache {MEDIAN_CACHE_PATH}: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    async def _search_api(self, term: str, year: int) -> Optional[List[CarCandidate]]:
+        """Fetch search results from the JSON API in the same shape as
+        _extract_car_urls. Returns None when the API can't be used."""
+        if self.api_blocked or not self.session:
+            return None
+
+        params = [
+            ('l1CategoryId', 91),
+            ('query', term),
+            ('attributeRanges[]', f'constructionYear:{year}:{year}'),
+            ('attributeRanges[]', 'mileage:null:180001'),
+            ('limit', _SEARCH_API_LIMIT),
+            ('offset', 0),
+        ]
+        await self.random_delay()
+        try:
+            response = await self.session.get(_SEARCH_API_URL, params=params)
+            if response.status_code == 403:
+                self.logger.warning("Marktplaats search API returned 403, falling back to Selenium")
+                self.api_blocked = True
+                return None
+            response.raise_for_status()
+            listings = response.json().get('listings') or []
+        except Exception as e:
+            self.logger.error(f"Error querying Marktplaats search API: {e}")
+            return None
 
-                    if not price or price <= 500:
-                        continue
+        candidates = []
+        for listing in listings:
+            # Fields can be null or of an unexpected type; skip such listings
+            # rather than failing the whole search
+            try:
+                url = join_url(self.base_url, listing.get('vipUrl') or '')
+                title = (listing.get('title') or '').strip()
+                if '/v/auto-s/' not in url or not title:
+                    continue
 
-                    if price > threshold:
-                        continue
+                price_cents = (listing.get('priceInfo') or {}).get('priceCents')
+                pictures = listing.get('pictures') or []
+                image_url = None
+                if pictures:
+                    image_url = pictures[0].get('largeUrl') or pictures[0].get('mediumUrl')
 
-                    profit_percentage = ((median_price - price) / median_price) * 100
-
-                    if profit_percentage >= 50:
-                        deal_rating = "excellent"
-                    elif profit_percentage >= 30:
-                        deal_rating = "good"
-                    else:
-                        deal_rating = "fair"
-
-                    make, model_name, parsed_year, mileage = self._parse_car_details(
-                        candidate.get('title', ''), term
-                    )
-
-                    images = []
-                    if candidate.get('image_url'):
-                        images.append(candidate['image_url'])
-
-                    car = {
-                        'url': url,
-                        'source_website': 'marktplaats.nl',
-                        'title': candidate.get('title', ''),
-                        'description': '',
-                        'price': price,
-                        'make': make,
-                        'model': model_name,
-                        'year': parsed_year or year,
-                        'mileage': mileage,
-                        'location': candidate.get('location', ''),
-                        'images': images,
-                        'damage_keywords': [],
-                        'has_cosmetic_damage_only': True,
-                        'market_price': median_price,
-                        'profit_percentage': round(profit_percentage, 1),
-                        'deal_rating': deal_rating,
-                    }
+                candidates.append(CarCandidate(
+                    url=url,
+                    title=title,
+                    price=float(price_cents) / 100 if price_cents else None,
+                    image_url=image_url,
+                    location=(listing.get('location') or {}).get('cityName') or '',
+                ))
 
-                    self.logger.info(
-                        f"Deal: {candidate.get('title', '')[:50]} | "
-                        f"€{price:.0f} vs median €{median_price:.0f} ({year}) | "
-                        f"{profit_percentage:.0f}% below | {deal_rating}"
-                    )
-                    all_cars.append(car)
-                    if on_car_found:
-                        await on_car_found(car)
+            except Exception as e:
+                self.logger.error(f"Error reading Marktplaats API listing: {e}")
+                continue
 
-        self.logger.info(f"Total below-market cars from Marktplaats: {len(all_cars)}")
-        return all_cars
+        return candidates
 
-    def _extract_car_urls(self, html: str, base_url: str) -> List[Dict]:
+    def _extract_car_urls(self, html: str, base_url: str) -> List[CarCandidate]:
         """Extract car URLs and basic info from search results page"""
-        soup = BeautifulSoup(html, 'html.parser')
+        if not html:
+            return []
+        root = lxml_html.fromstring(html)
         candidates = []
 
-        # Try multiple selectors
-        listings = (
-            soup.find_all('article', class_=re.compile(r'hz-Listing|Listing')) or
-            soup.find_all('li', class_=re.compile(r'hz-Listing|Listing')) or
-            soup.find_all('div', class_=re.compile(r'hz-Listing|Listing')) or
-            soup.find_all('a', href=re.compile(r'/v/auto-s/'))
-        )
-
-        if not listings:
-            listings = soup.find_all('a', href=re.compile(r'/v/auto-s/.+/a\d+'))
+        # Keep only the most specific kind of container found; the <a> fallback
+        # matches every /v/auto-s/ link, so it is used only when nothing else is
+        listings = _LISTING_XPATH(root)
+        if listings:
+            best = min(_LISTING_PRIORITY[elem.tag] for elem in listings)
+            listings = [elem for elem in listings if _LISTING_PRIORITY[elem.tag] == best]
 
         for listing in listings:
             try:
+                fields = _preview_fields(listing)
+
                 # Get URL
-                if listing.name == 'a':
-                    url = urljoin(base_url, listing.get('href', ''))
+                if listing.tag == 'a':
+                    url = join_url(base_url, listing.get('href', ''))
                 else:
-                    link_elem = listing.find('a', href=True)
-                    if not link_elem:
+                    link_elem = fields.get('a')
+                    if link_elem is None:
                         continue
-                    url = urljoin(base_url, link_elem['href'])
+                    url = join_url(base_url, link_elem.get('href'))
 
                 if '/v/auto-s/' not in url:
                     continue
 
                 # Get title from search preview
                 title = ''
-                for selector in ['h3', 'h2', 'h4']:
-                    title_elem = listing.find(selector)
-                    if title_elem:
-                        title = title_elem.get_text(strip=True)
-                        break
-                if not title:
-                    title_elem = listing.find(class_=re.compile(r'title|Title|name|Name'))
-                    if title_elem:
-                        title = title_elem.get_text(strip=True)
+                for field in _TITLE_FIELDS:
+                    title_elem = fields.get(field)
+                    if title_elem is not None:
+                        title = title_elem.text_content().strip()
+                        if title:
+                            break
 
                 if not title:
                     continue
 
                 # Get preview image
-                img_elem = listing.find('img')
+                img_elem = fields.get('img')
                 image_url = None
-                if img_elem:
+                if img_elem is not None:
                     image_url = img_elem.get('src') or img_elem.get('data-src')
 
                 # Get price from preview
                 price = None
-                price_elem = listing.find(class_=re.compile(r'price|Price|prijs'))
-                if price_elem:
-                    price = self.clean_price(price_elem.get_text(strip=True))
+                price_elem = fields.get('price')
+                if price_elem is not None:
+                    price = self.clean_price(price_elem.text_content().strip())
                 else:
-                    full_text = listing.get_text(separator=' ', strip=True)
-                    price_match = re.search(r'€\s*([\d.,]+)', full_text)
+                    # Only built when there is no price element. text_content()
+                    # would run sibling elements together ("€ 5.000" + "120.000 km"),
+                    # so join the text nodes with a space and collapse the whitespace
+                    full_text = ' '.join(' '.join(listing.itertext()).split())
+                    price_match = _PRICE_EUR_RE.search(full_text)
                     if price_match:
                         price = self.clean_price(price_match.group(0))
 
                 # Get location from preview
-                location_elem = listing.find(class_=re.compile(r'location|Location'))
-                location = location_elem.get_text(strip=True) if location_elem else ''
+                location_elem = fields.get('location')
+                location = location_elem.text_content().strip() if location_elem is not None else ''
 
-                candidates.append({
-                    'url': url,
-                    'title': title,
-                    'price': price,
-                    'image_url': image_url,
-                    'location': location,
-                })
+                candidates.append(CarCandidate(
+                    url=url,
+                    title=title,
+                    price=price,
+                    image_url=image_url,
+                    location=location,
+                ))
 
             except Exception as e:
                 self.logger.error(f"Error extracting car URL: {e}")
@@ -252,58 +570,10 @@ class MarktplaatsScraper(BaseScraper):
         return candidates
 
     def _parse_car_details(self, text: str, search_term: str = '') -> tuple:
-        text_lower = text.lower()
-
-        car_makes = {
-            'volkswagen': 'Volkswagen', 'vw': 'Volkswagen', 'audi': 'Audi',
-            'bmw': 'BMW', 'mercedes': 'Mercedes-Benz', 'opel': 'Opel',
-            'ford': 'Ford', 'renault': 'Renault', 'peugeot': 'Peugeot',
-            'citroën': 'Citroën', 'citroen': 'Citroën', 'toyota': 'Toyota',
-            'nissan': 'Nissan', 'honda': 'Honda', 'mazda': 'Mazda',
-            'hyundai': 'Hyundai', 'kia': 'Kia', 'volvo': 'Volvo',
-            'seat': 'SEAT', 'skoda': 'Škoda', 'fiat': 'Fiat',
-            'alfa romeo': 'Alfa Romeo', 'mini': 'MINI', 'smart': 'Smart',
-            'dacia': 'Dacia', 'suzuki': 'Suzuki', 'mitsubishi': 'Mitsubishi',
-            'porsche': 'Porsche', 'tesla': 'Tesla',
-        }
-
-        make = None
-        make_key_found = None
-        for key, value in car_makes.items():
-            if key in text_lower:
-                make = value
-                make_key_found = key
-                break
-
-        year_match = re.search(r'\b(20[0-2]\d|19[89]\d)\b', text)
-        year = int(year_match.group(1)) if year_match else None
-
-        mileage = None
-        mileage_match = re.search(r'(\d{1,3}(?:[.,]\d{3})*)\s*km', text_lower)
-        if mileage_match:
-            mileage = self.clean_mileage(mileage_match.group(1))
-
-        # Extract model from text (word after make name)
-        model = None
-        if make_key_found:
-            after_make = text_lower.split(make_key_found, 1)[1].strip()
-            if after_make:
-                model_match = re.match(r'^([a-z0-9\-]+)', after_make)
-                if model_match:
-                    candidate = model_match.group(1)
-                    if candidate not in ('schade', 'met', 'auto', 'te', 'koop', 'de', 'met'):
-                        model = candidate.title()
-
-        # Fallback: extract model from search term
-        if not model and search_term:
-            term_lower = search_term.lower()
-            for key in car_makes:
-                if term_lower.startswith(key):
-                    remainder = term_lower[len(key):].strip()
-                    if remainder:
-                        model = remainder.split()[0].title()
-                    break
-
+        make, model, year, mileage_text = _parse_details_cached(
+            text.lower().translate(FOLD_ACCENTS), search_term.lower().translate(FOLD_ACCENTS)
+        )
+        mileage = self.clean_mileage(mileage_text) if mileage_text else None
         return make, model, year, mileage
 
     # Keep the abstract method signature compatible
@@ -1,17 +1,19 @@
 import re
-import time
+import asyncio
 import statistics
-from typing import List, Dict, Optional
-from bs4 import BeautifulSoup
+from types import MappingProxyType
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+from lxml import etree, html as lxml_html
 from urllib.parse import urljoin
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, build_make_automaton, find_make, join_url
 import logging
 
 # Same year range as Marktplaats scraper
 MIN_YEAR = 2014
 MAX_YEAR = 2019
 
-MAKE_MAP = {
+MAKE_MAP = MappingProxyType({
     'volkswagen': 'Volkswagen', 'vw': 'Volkswagen', 'audi': 'Audi',
     'bmw': 'BMW', 'mercedes': 'Mercedes-Benz', 'mercedes-benz': 'Mercedes-Benz',
     'opel': 'Opel', 'ford': 'Ford', 'renault': 'Renault', 'peugeot': 'Peugeot',
@@ -23,75 +25,185 @@ MAKE_MAP = {
     'dacia': 'Dacia', 'suzuki': 'Suzuki', 'mitsubishi': 'Mitsubishi',
     'porsche': 'Porsche', 'tesla': 'Tesla', 'land rover': 'Land Rover',
     'jaguar': 'Jaguar', 'jeep': 'Jeep', 'chrysler': 'Chrysler',
-}
+})
+
+# Search terms in flight at once. Kept modest since they all hit one host;
+# browser renders are further limited by the driver pool.
+_SEARCH_CONCURRENCY = 4
+
+# Finds every make key in a title with one scan, whatever the number of makes
+_MAKES_AC = build_make_automaton(MAKE_MAP)
+# Make keys for prefix matching search terms, multi-word makes first
+_MAKES_LONGEST_FIRST = tuple(sorted(MAKE_MAP, key=len, reverse=True))
+
+# Patterns used per listing, compiled once
+_CAR_LINK_RE = re.compile(r'/nl/schade/personenautos/.+/o/\d+')
+_CAR_LINK_CSS = "a[href*='/nl/schade/personenautos/'][href*='/o/']"
+# The contains() tests narrow the anchors in C, so the EXSLT regex (which
+# lxml runs through Python's re) only sees likely car links
+_CAR_LINK_XPATH = etree.XPath(
+    "//a[contains(@href, '/nl/schade/personenautos/') and contains(@href, '/o/')"
+    " and re:test(@href, $pattern)]",
+    namespaces={'re': 'http://exslt.org/regular-expressions'},
+)
+# Each <img>'s src, or its data-src when src is missing or empty, in page order
+_IMG_SRC_XPATH = etree.XPath(
+    "//img/@src[. != ''] | //img[not(@src) or @src = '']/@data-src",
+    smart_strings=False,
+)
+_IMG_EXT_RE = re.compile(r'\.(?:jpe?g|png|webp)', re.IGNORECASE)
+# Visible text under an element, the way BeautifulSoup's get_text sees it
+_TEXT_XPATH = etree.XPath(".//text()[not(ancestor::script or ancestor::style)]")
+_YEAR_RE = re.compile(r'\b(19[89]\d|20[0-2]\d)\b')
+_NUMBER_RE = re.compile(r'([\d.,]+)')
+_NON_PRICE_RE = re.compile(r'[^\d.,]')
+# Dutch amount: '.' groups thousands, one ',' starts the (possibly empty) decimals
+_DUTCH_PRICE_RE = re.compile(r'([\d.]*)(?:,([\d.]*))?')
+# First word after the make; matched from the make's end offset
+_MODEL_RE = re.compile(r'\s*([a-z0-9\-]+)')
+
+FUEL_TYPES = MappingProxyType({'benzine': 'Benzine', 'diesel': 'Diesel', 'elektrisch': 'Elektrisch',
+                               'hybride': 'Hybride', 'lpg': 'LPG'})
+# Prices, year, mileage and fuel type in one alternation so a listing's text
+# is scanned once for all of them
+_LISTING_FIELDS_RE = re.compile(
+    r'€\s*(?P<price>[\d.,]+)'
+    r'|\b(?P<year>19[89]\d|20[0-2]\d)\b'
+    r'|(?P<mileage>\d{1,3}(?:[.,]\d{3})*)\s*km'
+    r'|(?P<fuel>' + '|'.join(FUEL_TYPES) + r')',
+    re.IGNORECASE,
+)
+
+
+def _text(elem, separator: str = '') -> str:
+    """Stripped, non-empty text pieces under elem joined by separator"""
+    return separator.join(t for t in (s.strip() for s in _TEXT_XPATH(elem)) if t)
+
+
+@lru_cache(maxsize=4096)
+def _parse_make_model_cached(title_lower: str) -> Tuple[Optional[str], Optional[str]]:
+    """Make and model from a lowercased title. Titles repeat across search
+    terms that hit the same listings, so results are cached."""
+    found = find_make(_MAKES_AC, title_lower)
+    if found is None:
+        return None, None
+    make_key, _, make_end = found
+
+    make = MAKE_MAP[make_key]
+    model = None
+    model_match = _MODEL_RE.match(title_lower, make_end)
+    if model_match:
+        model = model_match.group(1).title()
+
+    return make, model
+
+
+@lru_cache(maxsize=256)
+def _db_market_prices(make: str, model: str) -> Dict[int, Tuple[Optional[float], int]]:
+    """Per year in MIN_YEAR..MAX_YEAR, the median market_price of Marktplaats
+    cars in the DB for a lowercased make/model and the number of prices it came
+    from. One query covers every year; search terms that map to the same
+    make/model share the result within a run."""
+    from sqlalchemy import func, select
+    from database.database import engine
+    from database.models import Car
+
+    # Plain columns, so a Core select on a connection is enough; ilike still
+    # compiles to something SQLite understands
+    conditions = (
+        Car.source_website == 'marktplaats.nl',
+        Car.make.ilike(f'%{make}%'),
+        Car.model.ilike(f'%{model}%'),
+        Car.year.between(MIN_YEAR, MAX_YEAR),
+        Car.market_price.isnot(None),
+        Car.market_price != 0,
+    )
+
+    if engine.dialect.name == 'postgresql':
+        # Let Postgres compute the medians; only one row per year comes back
+        query = (
+            select(Car.year, func.count(), func.percentile_cont(0.5).within_group(Car.market_price))
+            .where(*conditions)
+            .group_by(Car.year)
+        )
+        with engine.connect() as conn:
+            rows = conn.execute(query).all()
+        return {year: (median if count >= 3 else None, count) for year, count, median in rows}
+
+    # SQLite has no median aggregate; fetch the prices and take it here
+    with engine.connect() as conn:
+        rows = conn.execute(select(Car.year, Car.market_price).where(*conditions)).all()
+
+    prices_by_year: Dict[int, List[float]] = {}
+    for year, market_price in rows:
+        prices_by_year.setdefault(year, []).append(market_price)
+
+    return {
+        year: (statistics.median(prices) if len(prices) >= 3 else None, len(prices))
+        for year, prices in prices_by_year.items()
+    }
 
 
 class SchadeautosScraper(BaseScraper):
+    # Shared across instances; built on first fallback lookup
+    _market_service = None
+
     def __init__(self):
         super().__init__(use_selenium=True)
         self.base_url = "https://www.schadeautos.nl"
 
     async def scrape_search_results(self, search_terms: List[str], max_pages: int = 5, on_car_found=None, on_progress=None, website_name: str = 'schadeautos.nl') -> List[Dict]:
-        all_cars = []
-        seen_urls = set()
+        # URL -> car for deals, None for listings seen but rejected
+        cars_by_url: Dict[str, Optional[Dict]] = {}
         search_count = 0
         total_searches = len(search_terms)
+        semaphore = asyncio.Semaphore(_SEARCH_CONCURRENCY)
+
+        async def scrape_term(term: str):
+            nonlocal search_count
 
-        for term in search_terms:
             search_count += 1
             self.logger.info(f"[{search_count}] Searching schadeautos.nl: {term}")
             if on_progress:
                 on_progress(search_count, total_searches, term, website_name)
 
-            # Restart browser every 10 searches to prevent memory crashes
-            if search_count > 1 and search_count % 10 == 0:
-                try:
-                    await self.restart_browser()
-                except Exception as e:
-                    self.logger.error(f"Failed to restart browser: {e}")
-                    break
-
             make_slug, model_slug, proper_make, proper_model = self._term_to_parts(term)
             if not make_slug or not model_slug:
                 self.logger.warning(f"Could not parse make/model from: {term}")
-                continue
+                return
 
             search_url = f"{self.base_url}/nl/schade/personenautos/{make_slug}/{model_slug}"
             self.logger.info(f"URL: {search_url}")
 
-            # Navigate away first to force full reload
-            if self.driver:
-                try:
-                    self.driver.get("about:blank")
-                    time.sleep(0.5)
-                except Exception:
-                    pass
-
-            html = await self.get_page(search_url)
+            # Result pages are server-rendered; only use the browser when the
+            # plain HTTP response has no car links in it
+            html = ""
+            if self.session:
+                await self.random_delay()
+                html = await self._get_page_session(search_url)
+            if not _CAR_LINK_RE.search(html):
+                # Returns as soon as listings render, waiting at most the 5s the old fixed sleeps took.
+                # The HTTP attempt already waited, so the render doesn't wait again.
+                html = await self.render_page(search_url, _CAR_LINK_CSS, timeout=5, delay=not self.session)
             if not html:
                 self.logger.warning(f"No HTML returned for: {term}")
-                continue
-
-            # Wait for JS to render listings
-            if self.driver:
-                try:
-                    time.sleep(3)
-                    self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(2)
-                    html = self.driver.page_source
-                except Exception as e:
-                    self.logger.error(f"Error during page interaction: {e}")
+                return
 
-            # Extract all cars for this make/model
-            candidates = self.extract_car_data(html, self.base_url)
-            self.logger.info(f"Found {len(candidates)} total listings for '{term}'")
+            # Extract all cars for this make/model, off the event loop
+            candidates = await asyncio.to_thread(self.extract_car_data, html, self.base_url)
+            self.logger.info(f"Found {len(candidates)} listings from {MIN_YEAR}-{MAX_YEAR} for '{term}'")
 
             if not candidates:
-                continue
+                return
+
+            # Bucket by year in one pass rather than rescanning every candidate per year
+            candidates_by_year: Dict[int, List[Dict]] = {}
+            for candidate in candidates:
+                candidates_by_year.setdefault(candidate.get('year'), []).append(candidate)
 
             # Process per year (same range as Marktplaats)
             for year in range(MIN_YEAR, MAX_YEAR + 1):
-                year_candidates = [c for c in candidates if c.get('year') == year]
+                year_candidates = candidates_by_year.get(year)
                 if not year_candidates:
                     continue
 
@@ -115,9 +227,9 @@ class SchadeautosScraper(BaseScraper):
                     url = candidate.get('url')
                     price = candidate.get('price')
 
-                    if not url or url in seen_urls:
+                    if not url or url in cars_by_url:
                         continue
-                    seen_urls.add(url)
+                    cars_by_url[url] = None
 
                     if not price or price <= 500:
                         continue
@@ -148,10 +260,30 @@ class SchadeautosScraper(BaseScraper):
                         f"€{price:.0f} vs market €{market_price:.0f} ({year}) | "
                         f"{profit_percentage:.0f}% below | {deal_rating}"
                     )
-                    all_cars.append(candidate)
+                    cars_by_url[url] = candidate
                     if on_car_found:
                         await on_car_found(candidate)
 
+        async def scrape_term_bounded(term: str):
+            async with semaphore:
+                # A failure must not reach gather: it would return while the
+                # other terms still hold pooled browsers, and the caller would
+                # close the scraper under them
+                try:
+                    await scrape_term(term)
+                except Exception as e:
+                    self.logger.error(f"Error searching schadeautos.nl for '{term}': {e}")
+
+        await asyncio.gather(*(scrape_term_bounded(term) for term in search_terms))
+
+        self.logger.debug(f"Make/model cache: {_parse_make_model_cached.cache_info()}")
+        self.logger.debug(f"DB market price cache: {_db_market_prices.cache_info()}")
+        # Titles rarely repeat between runs; don't let the cache outlive one
+        _parse_make_model_cached.cache_clear()
+        # The Marktplaats prices behind the medians change between runs
+        _db_market_prices.cache_clear()
+
+        all_cars = [car for car in cars_by_url.values() if car is not None]
         self.logger.info(f"Total below-market cars from SchadeAutos: {len(all_cars)}")
         return all_cars
 
@@ -160,7 +292,7 @@ class SchadeautosScraper(BaseScraper):
         term_lower = term.lower().strip()
 
         # Check multi-word makes first (e.g. "alfa romeo")
-        for key in sorted(MAKE_MAP.keys(), key=len, reverse=True):
+        for key in _MAKES_LONGEST_FIRST:
             if term_lower.startswith(key + ' '):
                 proper_make = MAKE_MAP[key]
                 make_slug = key.replace(' ', '-')
@@ -184,56 +316,41 @@ class SchadeautosScraper(BaseScraper):
     def _get_market_price_from_db(self, make: str, model: str, year: int) -> Optional[float]:
         """Query median market_price from Marktplaats cars already in the DB."""
         try:
-            from sqlalchemy.orm import sessionmaker
-            from database.database import engine
-            from database.models import Car
-
-            SessionLocal = sessionmaker(bind=engine)
-            session = SessionLocal()
-            try:
-                rows = (
-                    session.query(Car.market_price)
-                    .filter(
-                        Car.source_website == 'marktplaats.nl',
-                        Car.make.ilike(f'%{make}%'),
-                        Car.model.ilike(f'%{model}%'),
-                        Car.year == year,
-                        Car.market_price.isnot(None),
-                    )
-                    .all()
-                )
-                prices = [r.market_price for r in rows if r.market_price]
-                if len(prices) >= 3:
-                    median = statistics.median(prices)
-                    self.logger.debug(
-                        f"DB market price for {make} {model} {year}: €{median:.0f} "
-                        f"(from {len(prices)} Marktplaats listings)"
-                    )
-                    return median
-            finally:
-                session.close()
+            median, count = _db_market_prices(make.lower(), model.lower()).get(year, (None, 0))
         except Exception as e:
             self.logger.debug(f"DB market price query failed: {e}")
-        return None
+            return None
+        if median is not None:
+            self.logger.debug(
+                f"DB market price for {make} {model} {year}: €{median:.0f} "
+                f"(from {count} Marktplaats listings)"
+            )
+        return median
+
+    @classmethod
+    def _get_market_service(cls):
+        if cls._market_service is None:
+            # backend/ is already importable, as for the database imports above
+            from market_price_service import MarketPriceService
+            cls._market_service = MarketPriceService()
+        return cls._market_service
 
     def _get_market_price_from_service(self, make: str, model: str, year: int) -> Optional[float]:
         """Fallback: use MarketPriceService static estimates."""
         try:
-            import sys
-            import os
-            sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            from market_price_service import MarketPriceService
-            return MarketPriceService().get_market_price(make, model, year)
+            return self._get_market_service().get_market_price(make, model, year)
         except Exception as e:
             self.logger.debug(f"MarketPriceService lookup failed: {e}")
         return None
 
     def extract_car_data(self, html: str, base_url: str = "") -> List[Dict]:
-        soup = BeautifulSoup(html, 'html.parser')
+        if not html:
+            return []
+        root = lxml_html.fromstring(html)
         cars = []
 
         # SchadeAutos uses <a> tags linking to /nl/schade/personenautos/... with <h2> titles
-        car_links = soup.find_all('a', href=re.compile(r'/nl/schade/personenautos/.+/o/\d+'))
+        car_links = _CAR_LINK_XPATH(root, pattern=_CAR_LINK_RE.pattern)
 
         self.logger.info(f"Found {len(car_links)} car link elements")
 
@@ -249,53 +366,74 @@ class SchadeautosScraper(BaseScraper):
         return cars
 
     def _extract_single_car(self, link_elem, base_url: str) -> Optional[Dict]:
-        url = urljoin(base_url, link_elem.get('href', ''))
+        url = join_url(base_url, link_elem.get('href', ''))
         if not url:
             return None
 
-        full_text = link_elem.get_text(separator=' ', strip=True)
+        full_text = _text(link_elem, ' ')
         if not full_text or len(full_text) < 5:
             return None
 
-        # Title from <h2>
-        title_elem = link_elem.find('h2')
-        title = title_elem.get_text(strip=True) if title_elem else full_text.split('€')[0].strip()
-
-        # Price — schadeautos.nl shows two prices: lower "exportprijs" first, then the
-        # regular selling price. Take the MAXIMUM to get the actual asking price.
-        price = None
-        price_matches = re.findall(r'€\s*([\d.,]+)', full_text)
-        if price_matches:
-            valid_prices = []
-            for pm in price_matches:
-                p = self._parse_dutch_price(pm)
-                if p and p > 100:
-                    valid_prices.append(p)
-            if valid_prices:
-                price = max(valid_prices)
+        # Year, mileage, fuel and the photo all come from the link's <img> tags;
+        # collect them in one walk
+        imgs = list(link_elem.iter('img'))
+        alts = [img.get('alt', '') for img in imgs]
+
+        # The same fields as they appear in the text, as fallbacks for the alt texts
+        price_texts = []
+        text_year = None
+        text_mileage = None
+        text_fuel = None
+        for match in _LISTING_FIELDS_RE.finditer(full_text):
+            field = match.lastgroup
+            if field == 'price':
+                price_texts.append(match.group('price'))
+            elif field == 'year':
+                if text_year is None:
+                    text_year = int(match.group('year'))
+            elif field == 'mileage':
+                if text_mileage is None:
+                    text_mileage = match.group('mileage')
+            elif text_fuel is None:
+                text_fuel = FUEL_TYPES[match.group('fuel').lower()]
 
         # Year — first try icon alt texts (e.g. alt="1ste toelating: 2016"),
         # then fall back to a bare 4-digit number in the text.
         year = None
-        for img in link_elem.find_all('img'):
-            alt = img.get('alt', '')
+        for alt in alts:
             if 'toelating' in alt or 'bouwjaar' in alt:
-                ym = re.search(r'\b(19[89]\d|20[0-2]\d)\b', alt)
+                ym = _YEAR_RE.search(alt)
                 if ym:
                     year = int(ym.group(1))
                     break
         if not year:
-            year_match = re.search(r'\b(19[89]\d|20[0-2]\d)\b', full_text)
-            if year_match:
-                year = int(year_match.group(1))
+            year = text_year
+
+        # Only MIN_YEAR..MAX_YEAR cars are priced; skip the rest of the extraction
+        if not year or not MIN_YEAR <= year <= MAX_YEAR:
+            return None
+
+        # Title from <h2>
+        title_elem = link_elem.find('.//h2')
+        title = _text(title_elem) if title_elem is not None else full_text.split('€')[0].strip()
+
+        # Price — schadeautos.nl shows two prices: lower "exportprijs" first, then the
+        # regular selling price. Take the MAXIMUM to get the actual asking price.
+        price = None
+        valid_prices = []
+        for price_text in price_texts:
+            p = self._parse_dutch_price(price_text)
+            if p and p > 100:
+                valid_prices.append(p)
+        if valid_prices:
+            price = max(valid_prices)
 
         # Mileage — try icon alt texts first (e.g. alt="tellerstand: 125.000 km"),
         # then fall back to text.
         mileage = None
-        for img in link_elem.find_all('img'):
-            alt = img.get('alt', '')
+        for alt in alts:
             if 'tellerstand' in alt:
-                mm = re.search(r'([\d.,]+)', alt)
+                mm = _NUMBER_RE.search(alt)
                 if mm:
                     mileage_text = mm.group(1).replace('.', '').replace(',', '')
                     try:
@@ -303,41 +441,33 @@ class SchadeautosScraper(BaseScraper):
                     except ValueError:
                         pass
                 break
-        if not mileage:
-            mileage_match = re.search(r'(\d{1,3}(?:[.,]\d{3})*)\s*(?:km|KM)', full_text)
-            if mileage_match:
-                mileage_text = mileage_match.group(1).replace('.', '').replace(',', '')
-                try:
-                    mileage = int(mileage_text)
-                except ValueError:
-                    pass
+        if not mileage and text_mileage:
+            try:
+                mileage = int(text_mileage.replace('.', '').replace(',', ''))
+            except ValueError:
+                pass
 
         # Fuel type — try icon alt texts (e.g. alt="brandstof: benzine"), then text.
-        fuel_keywords = {'benzine': 'Benzine', 'diesel': 'Diesel', 'elektrisch': 'Elektrisch',
-                         'hybride': 'Hybride', 'lpg': 'LPG'}
         fuel_type = None
-        for img in link_elem.find_all('img'):
-            alt = img.get('alt', '').lower()
+        for alt in alts:
+            alt = alt.lower()
             if 'brandstof' in alt:
-                for key, value in fuel_keywords.items():
+                for key, value in FUEL_TYPES.items():
                     if key in alt:
                         fuel_type = value
                         break
                 break
         if not fuel_type:
-            text_lower = full_text.lower()
-            for key, value in fuel_keywords.items():
-                if key in text_lower:
-                    fuel_type = value
-                    break
+            fuel_type = text_fuel
 
         # Image — schadeautos.nl listing links contain multiple <img> tags: small icon
         # images (/gfx/...) and the actual car photo (/cache/picture/...).
         # Find the car photo specifically; fall back to the parent container.
         image_url = None
-        search_containers = [link_elem, link_elem.parent] if link_elem.parent else [link_elem]
+        parent = link_elem.getparent()
+        search_containers = [imgs, parent.iter('img')] if parent is not None else [imgs]
         for container in search_containers:
-            for img in container.find_all('img'):
+            for img in container:
                 src = img.get('src') or img.get('data-src') or img.get('data-lazy-src') or ''
                 if '/cache/picture/' in src:
                     image_url = src
@@ -349,7 +479,7 @@ class SchadeautosScraper(BaseScraper):
             if image_url:
                 break
         if image_url and not image_url.startswith('http'):
-            image_url = urljoin(base_url, image_url)
+            image_url = join_url(base_url, image_url)
 
         make, model = self._parse_make_model(title)
 
@@ -373,48 +503,40 @@ class SchadeautosScraper(BaseScraper):
     def _parse_dutch_price(self, price_text: str) -> Optional[float]:
         if not price_text:
             return None
-        cleaned = price_text.replace('.', '').replace(',', '.')
-        cleaned = re.sub(r'[^\d.]', '', cleaned)
-        try:
-            return float(cleaned)
-        except ValueError:
+        match = _DUTCH_PRICE_RE.fullmatch(_NON_PRICE_RE.sub('', price_text))
+        if not match:
+            return None
+        whole = match.group(1).replace('.', '')
+        decimals = (match.group(2) or '').replace('.', '')
+        if not whole and not decimals:
             return None
+        return float(f"{whole}.{decimals}")
 
     def _parse_make_model(self, title: str) -> tuple:
-        title_lower = title.lower()
-        make = None
-        model = None
-
-        for key, value in MAKE_MAP.items():
-            if title_lower.startswith(key) or f' {key} ' in f' {title_lower} ':
-                make = value
-                after_make = title_lower.split(key, 1)[1].strip() if key in title_lower else ''
-                if after_make:
-                    model_match = re.match(r'^([a-z0-9\-]+)', after_make)
-                    if model_match:
-                        model = model_match.group(1).title()
-                break
-
-        return make, model
+        return _parse_make_model_cached(title.lower())
 
     async def scrape_car_details(self, car_url: str) -> Optional[Dict]:
-        html = await self.get_page(car_url)
+        # Detail pages are server-rendered; only use the browser when the
+        # plain HTTP response has no car photos in it
+        html = ""
+        if self.session:
+            await self.random_delay()
+            html = await self._get_page_session(car_url)
+        if '/cache/picture/' not in html:
+            # The HTTP attempt already waited, so the browser doesn't wait again
+            html = await self.get_page(car_url, delay=not self.session)
         if not html:
             return None
 
-        soup = BeautifulSoup(html, 'html.parser')
-
         try:
+            root = lxml_html.fromstring(html)
             details = {}
-            img_elements = soup.find_all('img')
-            images = []
-            for img in img_elements:
-                src = img.get('src') or img.get('data-src')
-                if src and any(ext in src.lower() for ext in ['.jpg', '.jpeg', '.png', '.webp']):
-                    if not src.startswith('http'):
-                        src = urljoin(car_url, src)
-                    images.append(src)
-            details['images'] = list(set(images))
+            # dict.fromkeys keeps page order while dropping repeats
+            details['images'] = list(dict.fromkeys(
+                src if src.startswith('http') else urljoin(car_url, src)
+                for src in _IMG_SRC_XPATH(root)
+                if _IMG_EXT_RE.search(src)
+            ))
             return details
 
         except Exception as e:
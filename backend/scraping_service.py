@@ -1,4 +1,5 @@
 import asyncio
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
 from database.database import engine
 from database.models import Car, ScrapingSession
@@ -6,7 +7,7 @@ from scrapers.marktplaats_scraper import MarktplaatsScraper
 from scrapers.schadeautos_scraper import SchadeautosScraper
 import logging
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Set
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -41,45 +42,66 @@ class ScrapingService:
     def __init__(self):
         self.search_terms = list(TARGET_MODELS)
 
-    def _save_car(self, session, car_data: Dict) -> str:
-        """Save a single car to DB immediately. Returns 'added', 'updated', or 'skipped'."""
+    def _save_car(self, session, car_data: Dict, known_urls: Set[str]) -> str:
+        """Save a single car to DB immediately. Returns 'added', 'updated', or 'skipped'.
+
+        known_urls holds every URL already in the cars table, so new listings
+        are inserted without first querying for an existing row. A listing
+        saved by an overlapping run after the set was loaded hits the unique
+        URL constraint instead, and is then updated like a known one.
+        """
         year = car_data.get('year')
         if year is not None and year < 2014:
             return 'skipped'
 
-        existing_car = session.query(Car).filter_by(url=car_data.get('url')).first()
-        if existing_car:
-            for key, value in car_data.items():
-                if key != 'first_seen' and hasattr(existing_car, key) and value is not None:
-                    setattr(existing_car, key, value)
-            existing_car.last_updated = datetime.utcnow()
+        url = car_data.get('url')
+        if url in known_urls:
+            existing_car = session.query(Car).filter_by(url=url).first()
+            if existing_car:
+                self._update_car(session, existing_car, car_data)
+                return 'updated'
+
+        new_car = Car(
+            url=car_data.get('url'),
+            source_website=car_data.get('source_website'),
+            title=car_data.get('title'),
+            description=car_data.get('description'),
+            price=car_data.get('price'),
+            make=car_data.get('make'),
+            model=car_data.get('model'),
+            year=car_data.get('year'),
+            mileage=car_data.get('mileage'),
+            location=car_data.get('location', ''),
+            images=car_data.get('images', []),
+            damage_keywords=car_data.get('damage_keywords', []),
+            has_cosmetic_damage_only=car_data.get('has_cosmetic_damage_only', True),
+            market_price=car_data.get('market_price'),
+            profit_percentage=car_data.get('profit_percentage'),
+            deal_rating=car_data.get('deal_rating'),
+            first_seen=datetime.utcnow(),
+            last_updated=datetime.utcnow(),
+            is_active=True
+        )
+        session.add(new_car)
+        try:
             session.commit()
+        except IntegrityError:
+            session.rollback()
+            existing_car = session.query(Car).filter_by(url=url).first()
+            if existing_car is None:
+                raise
+            known_urls.add(url)
+            self._update_car(session, existing_car, car_data)
             return 'updated'
-        else:
-            new_car = Car(
-                url=car_data.get('url'),
-                source_website=car_data.get('source_website'),
-                title=car_data.get('title'),
-                description=car_data.get('description'),
-                price=car_data.get('price'),
-                make=car_data.get('make'),
-                model=car_data.get('model'),
-                year=car_data.get('year'),
-                mileage=car_data.get('mileage'),
-                location=car_data.get('location', ''),
-                images=car_data.get('images', []),
-                damage_keywords=car_data.get('damage_keywords', []),
-                has_cosmetic_damage_only=car_data.get('has_cosmetic_damage_only', True),
-                market_price=car_data.get('market_price'),
-                profit_percentage=car_data.get('profit_percentage'),
-                deal_rating=car_data.get('deal_rating'),
-                first_seen=datetime.utcnow(),
-                last_updated=datetime.utcnow(),
-                is_active=True
-            )
-            session.add(new_car)
-            session.commit()
-            return 'added'
+        known_urls.add(url)
+        return 'added'
+
+    def _update_car(self, session, existing_car: Car, car_data: Dict):
+        for key, value in car_data.items():
+            if key != 'first_seen' and hasattr(existing_car, key) and value is not None:
+                setattr(existing_car, key, value)
+        existing_car.last_updated = datetime.utcnow()
+        session.commit()
 
     async def _scrape_with_scraper(self, scraper, website_name: str, search_terms: List[str] = None, max_pages: int = 3, on_progress=None) -> Dict:
         """Run a single scraper and save results to database in real-time"""
@@ -101,10 +123,12 @@ class ScrapingService:
 
             await scraper.setup()
 
+            known_urls = {url for (url,) in session.query(Car.url)}
+
             async def on_car_found(car_data: Dict):
                 nonlocal cars_added, cars_updated, cars_found
                 try:
-                    result = self._save_car(session, car_data)
+                    result = self._save_car(session, car_data, known_urls)
                     cars_found += 1
                     if result == 'added':
                         cars_added += 1
@@ -113,6 +137,8 @@ class ScrapingService:
                         cars_updated += 1
                 except Exception as e:
                     logger.error(f"Error saving car: {e}")
+                    # Leave the session usable for the next car and the final commit
+                    session.rollback()
 
             await scraper.scrape_search_results(
                 search_terms=search_terms or [],
@@ -4,6 +4,7 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 # from webdriver_manager.chrome import ChromeDriverManager
 import time
 import random
@@ -11,6 +12,70 @@ import re
 import logging
 from typing import List, Dict, Optional
 from urllib.parse import urljoin
+from scrapers.helpers import FOLD_ACCENTS, load_search_page
+
+DAMAGE_KEYWORDS = (
+    'schade', 'damage', 'beschadigd', 'damaged', 'lakschade', 'deuk', 'dent',
+    'krassen', 'scratch', 'kras', 'hagelschade', 'cosmetische', 'cosmetic',
+    'lichte schade', 'minor damage', 'kleine schade', 'oppervlakkige',
+    'parkeerdeuk', 'bumperdeuk', 'deukje', 'deukjes'
+)
+
+# Car buying services and commercial vehicles, not passenger cars
+EXCLUDE_KEYWORDS = (
+    # Car buying services
+    'inkoop', 'gezocht', 'gevraagd', 'kopen wij', 'we buy', 'auctim',
+    # Most problematic commercial vehicles
+    'sprinter', 'crafter', 'transit',
+    'bestelauto', 'bestelwagen', 'vrachtwagen', 'truck', 'bakwagen',
+    # Car buying/selling services
+    'bedrijfsauto verkopen', 'autoverkoopsite', 'auto opkoper'
+)
+
+# Common Dutch city patterns
+CITIES = ('amsterdam', 'rotterdam', 'den haag', 'utrecht', 'eindhoven', 'tilburg', 'groningen', 'almere', 'breda', 'nijmegen')
+
+CAR_MAKES = {
+    'volkswagen': 'Volkswagen', 'vw': 'Volkswagen', 'audi': 'Audi',
+    'bmw': 'BMW', 'mercedes': 'Mercedes-Benz', 'opel': 'Opel',
+    'ford': 'Ford', 'renault': 'Renault', 'peugeot': 'Peugeot',
+    'citroen': 'Citroën', 'toyota': 'Toyota',
+    'nissan': 'Nissan', 'honda': 'Honda', 'mazda': 'Mazda',
+    'hyundai': 'Hyundai', 'kia': 'Kia', 'volvo': 'Volvo',
+    'seat': 'Seat', 'skoda': 'Skoda', 'fiat': 'Fiat'
+}
+
+# All makes in one alternation; longest keys first so a longer make wins at the same position
+_MAKES_RE = re.compile(r'\b(' + '|'.join(map(re.escape, sorted(CAR_MAKES, key=len, reverse=True))) + r')\b')
+
+# Severe damage (exclude these)
+SEVERE_KEYWORDS = (
+    'motorschade', 'engine damage', 'versnellingsbak', 'transmission',
+    'water schade', 'flood', 'brand schade', 'fire', 'total loss',
+    'niet rijdend', 'export only'
+)
+
+# Exclusion only needs the first hit, which a single alternation finds
+_EXCLUDE_RE = re.compile('|'.join(map(re.escape, EXCLUDE_KEYWORDS)))
+
+# Any of the selectors find_car_listings tries
+_LISTING_CSS = ".hz-Listing, [data-listing-id], article[class*='listing'], .mp-listing"
+
+# href of the first listing's link, or null while no listing is on the page.
+# Read in the page so a re-rendered listing can never be a stale element.
+_FIRST_LISTING_HREF_JS = (
+    "const listing = document.querySelector(arguments[0]);"
+    " if (!listing) return null;"
+    " const link = listing.matches('a[href]') ? listing : listing.querySelector('a[href]');"
+    " return link ? link.href : '';"
+)
+
+# Per-listing patterns, compiled once
+_PRICE_EUR_RE = re.compile(r'€\s*([\d.,]+)')
+_YEAR_RE = re.compile(r'\b(19[9][0-9]|20[0-2][0-9])\b')
+_MILEAGE_RE = re.compile(r'(\d{1,3}(?:[.,]\d{3})*)\.?\s*km')
+_NON_NUMERIC_RE = re.compile(r'[^\d.,]')
+
 
 class SeleniumScraper:
     def __init__(self, headless=True):
@@ -56,6 +121,7 @@ class SeleniumScraper:
     def scrape_marktplaats_budget_cars(self, min_price: int = 1300, max_price: int = 5000, max_results: int = 50) -> List[Dict]:
         """Scrape Marktplaats for cars under max_price using Selenium"""
         all_cars = []
+        seen_urls = set()  # Brand and keyword searches overlap; keep each listing once
 
         try:
             # Build search URL with price filter and damage-related search terms
@@ -86,10 +152,7 @@ class SeleniumScraper:
                     break
 
                 self.logger.info(f"Navigating to: {search_url}")
-                self.driver.get(search_url)
-
-                # Wait for page to load
-                self.random_delay(3, 6)
+                load_search_page(self.driver, search_url, _LISTING_CSS, self.logger)
 
                 # Accept cookies if present (only once)
                 if search_url == damage_searches[0]:
@@ -126,20 +189,20 @@ class SeleniumScraper:
                                 page_cars.append(car)
                                 self.logger.debug(f"Extracted car: {car['title'][:50]}...")
 
-                            # Add small delay to avoid overwhelming the browser
-                            if i % 10 == 0 and i > 0:
-                                time.sleep(0.5)
-
                         except Exception as e:
                             self.logger.warning(f"Error processing listing {i+1}: {e}")
                             continue
 
                     # Since we're searching for damage terms, accept all valid cars
-                    damage_cars = page_cars.copy()
-                    for car in damage_cars:
+                    damage_cars = []
+                    for car in page_cars:
+                        if car['url'] in seen_urls:
+                            continue
+                        seen_urls.add(car['url'])
                         # Ensure all cars have damage keywords since we searched for damage
                         if len(car.get('damage_keywords', [])) == 0:
                             car['damage_keywords'] = ['schade']  # Add generic damage keyword
+                        damage_cars.append(car)
 
                     self.logger.info(f"Found {len(damage_cars)} cars with damage on page {page}")
                     all_cars.extend(damage_cars)
@@ -147,28 +210,32 @@ class SeleniumScraper:
 
                     # Try to go to next page
                     if len(all_cars) < max_results and search_cars < 20:
+                        first_href = self.driver.execute_script(_FIRST_LISTING_HREF_JS, _LISTING_CSS)
                         if not self.go_to_next_page():
                             break
                         page += 1
-                        self.random_delay(3, 6)
+                        # Wait for the next page's results. The listing elements
+                        # may be reused and only updated, so wait for the first
+                        # listing to link somewhere else rather than go stale.
+                        try:
+                            WebDriverWait(self.driver, 10).until(
+                                lambda d: d.execute_script(_FIRST_LISTING_HREF_JS, _LISTING_CSS) not in (None, first_href)
+                            )
+                        except TimeoutException:
+                            # The loop re-queries the listings either way
+                            self.logger.info("Next page did not load within 10s")
                     else:
                         break
 
         except Exception as e:
             self.logger.error(f"Error during scraping: {e}")
 
-        return self.deduplicate_cars(all_cars[:max_results])
+        return all_cars[:max_results]
 
     def check_damage_keywords(self, text: str) -> bool:
         """Check if text contains actual damage keywords"""
-        damage_keywords = [
-            'schade', 'damage', 'lakschade', 'deuk', 'dent', 'krassen', 'scratch',
-            'kras', 'hagelschade', 'cosmetische', 'cosmetic', 'lichte schade',
-            'minor damage', 'kleine schade', 'oppervlakkige', 'parkeerdeuk',
-            'bumperdeuk', 'deukje', 'deukjes', 'beschadigd', 'damaged'
-        ]
         text_lower = text.lower()
-        return any(keyword in text_lower for keyword in damage_keywords)
+        return any(keyword in text_lower for keyword in DAMAGE_KEYWORDS)
 
     def find_car_listings(self) -> List:
         """Find car listing elements on the page"""
@@ -211,25 +278,23 @@ class SeleniumScraper:
             if not title or len(title) < 5:
                 return None
 
-            # Filter out car buying services, lease cars, trucks, and non-passenger cars
-            title_lower = title.lower()
-            full_text_lower = full_text.lower()
-
-            exclude_keywords = [
-                # Car buying services
-                'inkoop', 'gezocht', 'gevraagd', 'kopen wij', 'we buy', 'auctim',
-                # Most problematic commercial vehicles
-                'sprinter', 'crafter', 'transit',
-                'bestelauto', 'bestelwagen', 'vrachtwagen', 'truck', 'bakwagen',
-                # Car buying/selling services
-                'bedrijfsauto verkopen', 'autoverkoopsite', 'auto opkoper'
-            ]
+            # Lowercase and fold accents once for all keyword checks; the title is the first line of full_text
+            full_text_lower = full_text.lower().translate(FOLD_ACCENTS)
 
-            # Check title and description for exclusion keywords
-            text_to_check = title_lower + " " + full_text_lower
-            if any(keyword in text_to_check for keyword in exclude_keywords):
+            # Filter out car buying services, lease cars, trucks, and non-passenger cars
+            if _EXCLUDE_RE.search(full_text_lower):
                 return None
 
+            # Extract price from text (faster than DOM queries). Checked before the
+            # URL lookup so rejected listings cost no WebDriver round trips.
+            price = None
+            price_match = _PRICE_EUR_RE.search(full_text)
+            if price_match:
+                price = self.clean_price(price_match.group())
+                # More lenient price filtering to get some results
+                if price and price > max_price * 2:  # Only exclude if way too expensive
+                    return None
+
             # Get URL with single query
             url = ""
             try:
@@ -242,20 +307,11 @@ class SeleniumScraper:
             except:
                 return None
 
-            # Extract price from text (faster than DOM queries)
-            price = None
-            price_match = re.search(r'€\s*([\d.,]+)', full_text)
-            if price_match:
-                price = self.clean_price(price_match.group())
-                # More lenient price filtering to get some results
-                if price and price > max_price * 2:  # Only exclude if way too expensive
-                    return None
-
             # Simple location extraction
-            location = self.extract_location(full_text)
+            location = self.extract_location(full_text_lower)
 
             # Parse car details first
-            make, model, year, mileage = self.parse_car_details(title, full_text)
+            make, model, year, mileage = self.parse_car_details(full_text_lower)
 
             # Since we're searching for damage terms, accept most cars for now
             # We'll filter out the bad ones later in post-processing
@@ -284,32 +340,14 @@ class SeleniumScraper:
 
     def has_damage_keywords(self, car: Dict) -> bool:
         """Check if car has damage keywords and add them to the car data"""
-        damage_keywords = [
-            'schade', 'damage', 'beschadigd', 'damaged', 'lakschade', 'deuk', 'dent',
-            'krassen', 'scratch', 'kras', 'hagelschade', 'cosmetische', 'cosmetic',
-            'lichte schade', 'minor damage', 'kleine schade', 'oppervlakkige',
-            'parkeerdeuk', 'bumperdeuk', 'deukje', 'deukjes'
-        ]
-
         text = (car.get('title', '') + " " + car.get('description', '')).lower()
 
-        found_keywords = []
-        for keyword in damage_keywords:
-            if keyword in text:
-                found_keywords.append(keyword)
+        found_keywords = [keyword for keyword in DAMAGE_KEYWORDS if keyword in text]
 
         car['damage_keywords'] = found_keywords
 
-        # Check for severe damage (exclude these)
-        severe_keywords = [
-            'motorschade', 'engine damage', 'versnellingsbak', 'transmission',
-            'water schade', 'flood', 'brand schade', 'fire', 'total loss',
-            'niet rijdend', 'export only'
-        ]
-
-        for keyword in severe_keywords:
-            if keyword in text:
-                return False
+        if any(keyword in text for keyword in SEVERE_KEYWORDS):
+            return False
 
         return len(found_keywords) > 0
 
@@ -341,45 +379,25 @@ class SeleniumScraper:
             self.logger.error(f"Error navigating to next page: {e}")
             return False
 
-    def extract_location(self, text: str) -> str:
-        """Extract location from text"""
-        # Common Dutch city patterns
-        cities = ['amsterdam', 'rotterdam', 'den haag', 'utrecht', 'eindhoven', 'tilburg', 'groningen', 'almere', 'breda', 'nijmegen']
-        text_lower = text.lower()
-
-        for city in cities:
+    def extract_location(self, text_lower: str) -> str:
+        """Extract location from lowercased text"""
+        for city in CITIES:
             if city in text_lower:
                 return city.title()
 
         return ""
 
-    def parse_car_details(self, title: str, description: str) -> tuple:
-        """Parse car make, model, year, and mileage from text"""
-        text = (title + " " + description).lower()
-
-        # Car makes
-        car_makes = {
-            'volkswagen': 'Volkswagen', 'vw': 'Volkswagen', 'audi': 'Audi',
-            'bmw': 'BMW', 'mercedes': 'Mercedes-Benz', 'opel': 'Opel',
-            'ford': 'Ford', 'renault': 'Renault', 'peugeot': 'Peugeot',
-            'citroën': 'Citroën', 'citroen': 'Citroën', 'toyota': 'Toyota',
-            'nissan': 'Nissan', 'honda': 'Honda', 'mazda': 'Mazda',
-            'hyundai': 'Hyundai', 'kia': 'Kia', 'volvo': 'Volvo',
-            'seat': 'Seat', 'skoda': 'Skoda', 'fiat': 'Fiat'
-        }
-
-        make = None
-        for key, value in car_makes.items():
-            if key in text:
-                make = value
-                break
+    def parse_car_details(self, text: str) -> tuple:
+        """Parse car make, model, year, and mileage from lowercased listing text"""
+        make_match = _MAKES_RE.search(text)
+        make = CAR_MAKES[make_match.group(1)] if make_match else None
 
         # Extract year
-        year_match = re.search(r'\b(19[9][0-9]|20[0-2][0-9])\b', text)
+        year_match = _YEAR_RE.search(text)
         year = int(year_match.group(1)) if year_match else None
 
         # Extract mileage
-        mileage_match = re.search(r'(\d{1,3}(?:[.,]\d{3})*)\.?\s*km', text)
+        mileage_match = _MILEAGE_RE.search(text)
         mileage = self.clean_mileage(mileage_match.group(1)) if mileage_match else None
 
         return make, None, year, mileage
@@ -391,7 +409,7 @@ class SeleniumScraper:
 
         # Remove currency symbols and clean
         price_text = str(price_text).replace("€", "").replace("EUR", "")
-        price_text = re.sub(r'[^\d.,]', '', price_text)
+        price_text = _NON_NUMERIC_RE.sub('', price_text)
 
         if not price_text:
             return None
@@ -424,18 +442,6 @@ class SeleniumScraper:
         except ValueError:
             return None
 
-    def deduplicate_cars(self, cars: List[Dict]) -> List[Dict]:
-        """Remove duplicate cars based on URL"""
-        seen_urls = set()
-        unique_cars = []
-
-        for car in cars:
-            if car.get('url') and car['url'] not in seen_urls:
-                seen_urls.add(car['url'])
-                unique_cars.append(car)
-
-        return unique_cars
-
 # Test function
 def test_selenium_scraper():
     scraper = None
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from scrapers.marktplaats_scraper import MarktplaatsScraper
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    monkeypatch.setattr('scrapers.marktplaats_scraper.MEDIAN_CACHE_PATH', str(tmp_path / 'median_cache.json'))
+    monkeypatch.setattr('scrapers.base_scraper.BROWSER_POOL_SIZE', 1)
+    scraper = MarktplaatsScraper()
+    monkeypatch.setattr(scraper, '_create_driver', FakeDriver)
+    return scraper
+
+
+def test_restart_browser_counts_replaced_drivers(scraper):
+    async def run():
+        await scraper._setup_selenium()
+        old = scraper._driver_pool.get_nowait()
+        scraper._driver_pool.put_nowait(old)
+        assert await scraper.restart_browser() == 1
+        assert old.quit_called
+
+        # A driver checked out by another search is not replaced
+        async with scraper._pooled_driver():
+            assert await scraper.restart_browser() == 0
+    asyncio.run(run())
+
+
+def test_cancelled_caller_does_not_return_busy_driver(scraper):
+    async def run():
+        await scraper._setup_selenium()
+        busy = scraper._driver_pool.get_nowait()
+        scraper._driver_pool.put_nowait(busy)
+
+        async def render():
+            async with scraper._pooled_driver():
+                await asyncio.sleep(10)
+        task = asyncio.create_task(render())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # The busy driver is quit and the pool shrinks until the next borrow
+        assert busy.quit_called
+        assert scraper._driver_pool.empty()
+        async with scraper._pooled_driver() as driver:
+            assert driver is not busy
+        assert scraper._driver_pool.qsize() == 1
+    asyncio.run(run())
+
+
+def test_failed_refill_of_an_empty_pool_raises(scraper, monkeypatch):
+    async def run():
+        await scraper._setup_selenium()
+        scraper._driver_pool.get_nowait()
+        scraper._pool_shortfall = 1
+
+        def fail():
+            raise RuntimeError('chrome did not start')
+        monkeypatch.setattr(scraper, '_create_driver', fail)
+        with pytest.raises(RuntimeError):
+            async with scraper._pooled_driver():
+                pass
+        # Still owed, so a later borrow tries again
+        assert scraper._pool_shortfall == 1
+    asyncio.run(run())
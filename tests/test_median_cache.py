@@ -0,0 +1,163 @@
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+import scrapers.marktplaats_scraper as marktplaats_scraper
+from scrapers.marktplaats_scraper import CarCandidate, MarktplaatsScraper
+
+
+@pytest.fixture
+def cache_path(tmp_path, monkeypatch):
+    path = tmp_path / 'median_cache.json'
+    monkeypatch.setattr(marktplaats_scraper, 'MEDIAN_CACHE_PATH', str(path))
+    return path
+
+
+def test_save_and_load_round_trip(cache_path):
+    scraper = MarktplaatsScraper()
+    entry = {'median': 4500.0, 'updated': time.time(), 'empty_runs': 1}
+    scraper._median_cache[('volkswagen polo', 2016)] = entry
+    scraper._save_median_cache()
+
+    assert json.loads(cache_path.read_text()) == {'volkswagen polo|2016': entry}
+    assert MarktplaatsScraper()._median_cache == {('volkswagen polo', 2016): entry}
+    # Nothing is left behind next to the cache file
+    assert os.listdir(cache_path.parent) == [cache_path.name]
+
+
+def test_load_drops_expired_entries(cache_path):
+    now = time.time()
+    cache_path.write_text(json.dumps({
+        'opel corsa|2015': {'median': 3000.0, 'updated': now},
+        'opel corsa|2014': {'median': 2500.0, 'updated': now - 2 * 24 * 60 * 60},
+    }))
+
+    assert MarktplaatsScraper()._median_cache == {
+        ('opel corsa', 2015): {'median': 3000.0, 'updated': now, 'empty_runs': 0},
+    }
+
+
+@pytest.mark.parametrize('content', [None, 'not json'])
+def test_load_missing_or_unreadable_cache(cache_path, content):
+    if content is not None:
+        cache_path.write_text(content)
+    assert MarktplaatsScraper()._median_cache == {}
+
+
+def test_load_skips_malformed_entries(cache_path):
+    now = time.time()
+    cache_path.write_text(json.dumps({
+        'opel corsa|2015': {'median': 3000.0, 'updated': now},
+        'opel corsa|abc': {'median': 3000.0, 'updated': now},
+        'opel corsa|2016': 'not an entry',
+        'opel corsa|2017': {'updated': now},
+        'opel corsa|2018': {'median': 3000.0, 'updated': 'yesterday'},
+        'opel corsa|2019': {'median': 3000.0, 'updated': now, 'empty_runs': 'many'},
+    }))
+
+    assert MarktplaatsScraper()._median_cache == {
+        ('opel corsa', 2015): {'median': 3000.0, 'updated': now, 'empty_runs': 0},
+    }
+
+
+def test_load_ignores_cache_that_is_not_an_object(cache_path):
+    cache_path.write_text('[1, 2, 3]')
+    assert MarktplaatsScraper()._median_cache == {}
+
+
+def test_failed_save_keeps_previous_cache(cache_path, monkeypatch):
+    cache_path.write_text('{"opel corsa|2015": {"median": 3000.0, "updated": 0}}')
+    scraper = MarktplaatsScraper()
+    scraper._median_cache[('opel corsa', 2016)] = {'median': 3500.0, 'updated': time.time()}
+
+    def fail_replace(src, dst):
+        raise OSError('disk full')
+    monkeypatch.setattr(marktplaats_scraper.os, 'replace', fail_replace)
+    scraper._save_median_cache()
+
+    assert cache_path.read_text() == '{"opel corsa|2015": {"median": 3000.0, "updated": 0}}'
+    assert os.listdir(cache_path.parent) == [cache_path.name]
+
+
+def _scrape(scraper, candidates_by_year):
+    async def search_api(term, year):
+        return candidates_by_year.get(year, [])
+    scraper._search_api = search_api
+    return asyncio.run(scraper.scrape_search_results(['volkswagen polo']))
+
+
+def _candidate(n, price):
+    return CarCandidate(
+        url=f'https://www.marktplaats.nl/v/auto-s/volkswagen/a{n}',
+        title=f'Volkswagen Polo {n}', price=price, image_url=None, location='',
+    )
+
+
+def test_fresh_median_is_cached(cache_path):
+    scraper = MarktplaatsScraper()
+    cars = _scrape(scraper, {2016: [_candidate(1, 4000.0), _candidate(2, 5000.0), _candidate(3, 6000.0)]})
+
+    assert cars == []
+    assert scraper._median_cache[('volkswagen polo', 2016)]['median'] == 5000.0
+    assert 'volkswagen polo|2016' in json.loads(cache_path.read_text())
+
+
+def test_cached_median_is_used_when_too_few_prices(cache_path):
+    cache_path.write_text(json.dumps({'volkswagen polo|2016': {'median': 5000.0, 'updated': time.time()}}))
+    scraper = MarktplaatsScraper()
+    cars = _scrape(scraper, {2016: [_candidate(1, 2000.0), _candidate(2, 4900.0)]})
+
+    assert [(car['price'], car['market_price']) for car in cars] == [(2000.0, 5000.0)]
+
+
+def test_cached_median_needs_a_fresh_price(cache_path):
+    cache_path.write_text(json.dumps({'volkswagen polo|2016': {'median': 5000.0, 'updated': time.time()}}))
+    scraper = MarktplaatsScraper()
+    cars = _scrape(scraper, {2016: [_candidate(1, None), _candidate(2, 400.0)]})
+
+    assert cars == []
+    assert scraper._median_cache[('volkswagen polo', 2016)].get('empty_runs', 0) == 0
+
+
+def test_search_without_deals_is_skipped_after_three_runs(cache_path):
+    searched = []
+
+    async def search_api(term, year):
+        searched.append(year)
+        return [_candidate(1, 4000.0), _candidate(2, 5000.0), _candidate(3, 6000.0)] if year == 2016 else []
+    scraper = MarktplaatsScraper()
+    scraper._search_api = search_api
+    for _ in range(4):
+        asyncio.run(scraper.scrape_search_results(['volkswagen polo']))
+
+    assert searched.count(2016) == 3
+    # Years that never had enough prices have no entry and are always searched
+    assert searched.count(2015) == 4
+
+
+def test_deal_resets_empty_runs(cache_path):
+    cache_path.write_text(json.dumps({
+        'volkswagen polo|2016': {'median': 5000.0, 'updated': time.time(), 'empty_runs': 2},
+    }))
+    scraper = MarktplaatsScraper()
+    cars = _scrape(scraper, {2016: [_candidate(1, 2000.0), _candidate(2, 5000.0), _candidate(3, 6000.0)]})
+
+    assert len(cars) == 1
+    assert scraper._median_cache[('volkswagen polo', 2016)]['empty_runs'] == 0
+
+
+def test_failed_search_does_not_stop_the_others(cache_path):
+    async def search_api(term, year):
+        if year == 2015:
+            raise RuntimeError('boom')
+        return [_candidate(1, 2000.0), _candidate(2, 5000.0), _candidate(3, 6000.0)] if year == 2016 else []
+    scraper = MarktplaatsScraper()
+    scraper._search_api = search_api
+    cars = asyncio.run(scraper.scrape_search_results(['volkswagen polo']))
+
+    assert [car['price'] for car in cars] == [2000.0]
+    # The run finishes normally, so the cache is still written
+    assert 'volkswagen polo|2016' in json.loads(cache_path.read_text())
@@ -0,0 +1,205 @@
+import asyncio
+
+import pytest
+
+from scrapers.marktplaats_scraper import MarktplaatsScraper
+from scrapers.schadeautos_scraper import SchadeautosScraper
+
+
+@pytest.fixture
+def marktplaats(tmp_path, monkeypatch):
+    monkeypatch.setattr('scrapers.marktplaats_scraper.MEDIAN_CACHE_PATH', str(tmp_path / 'median_cache.json'))
+    return MarktplaatsScraper()
+
+
+@pytest.fixture
+def schadeautos():
+    return SchadeautosScraper()
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('€ 3.450', 3450.0),
+    ('€ 1.950,-', 1950.0),
+    ('€ 9.999,50', 9999.5),
+    ('12.345', 12345.0),
+    ('prijs op aanvraag', None),
+    ('', None),
+])
+def test_clean_price(marktplaats, text, expected):
+    assert marktplaats.clean_price(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('123.456 km', 123456),
+    ('98,000 KM', 98000),
+    ('geen', None),
+    ('', None),
+])
+def test_clean_mileage(marktplaats, text, expected):
+    assert marktplaats.clean_mileage(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('2016', 2016),
+    ('bj. 2015', 2015),
+    ('1899', None),
+    ('', None),
+])
+def test_clean_year(marktplaats, text, expected):
+    assert marktplaats.clean_year(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('€ 3.250,-', 3250.0),
+    ('€ 12.345,67', 12345.67),
+    ('€ 1.234.567', 1234567.0),
+    ('2,5', 2.5),
+    (',-', None),
+    ('abc', None),
+    ('', None),
+])
+def test_parse_dutch_price(schadeautos, text, expected):
+    assert schadeautos._parse_dutch_price(text) == expected
+
+
+@pytest.mark.parametrize('title, expected', [
+    ('Volkswagen Polo 1.0 TSI', ('Volkswagen', 'Polo')),
+    ('VW Golf', ('Volkswagen', 'Golf')),
+    ('Mercedes-Benz A-klasse', ('Mercedes-Benz', 'A-Klasse')),
+    ('Alfa Romeo MiTo 1.4', ('Alfa Romeo', 'Mito')),
+    ('Schade: Skoda Fabia', ('Škoda', 'Fabia')),
+    ('opel', ('Opel', None)),
+    # Makes only count as whole words
+    ('Nissanx Note', (None, None)),
+])
+def test_schadeautos_parse_make_model(schadeautos, title, expected):
+    assert schadeautos._parse_make_model(title) == expected
+
+
+@pytest.mark.parametrize('text, search_term, expected', [
+    ('Volkswagen Polo 1.2 TSI 2016 123.456 km', '', ('Volkswagen', 'Polo', 2016, 123456)),
+    ('Citroën C3 met schade', '', ('Citroën', 'C3', None, None)),
+    ('VW Golf', '', ('Volkswagen', 'Golf', None, None)),
+    # A stopword after the make falls back to the model in the search term
+    ('Opel met schade 2015', 'opel corsa', ('Opel', 'Corsa', 2015, None)),
+    ('Onbekend merk', '', (None, None, None, None)),
+    # Makes only count as whole words
+    ('Minimale schade Volkswagen Polo 2016', '', ('Volkswagen', 'Polo', 2016, None)),
+    ('Smartphone app Renault Clio', '', ('Renault', 'Clio', None, None)),
+])
+def test_marktplaats_parse_car_details(marktplaats, text, search_term, expected):
+    assert marktplaats._parse_car_details(text, search_term) == expected
+
+
+SEARCH_RESULTS_HTML = """<html><body><ul>
+<li class="hz-Listing hz-Listing--list-item"><a href="/v/auto-s/volkswagen/a123-vw-polo">
+<h3>Volkswagen Polo 1.2 TSI 2016 met schade</h3><img src="https://images.marktplaats.com/1.jpg">
+<span class="hz-Listing-price">€ 3.450</span><span class="hz-Listing-location">Utrecht</span></a></li>
+<li class="hz-Listing"><a href="https://www.marktplaats.nl/v/auto-s/opel/a999-opel"><h3>Opel Corsa</h3>
+<p>€ 1.950,- 2015 98.000 km</p></a></li>
+<li class="hz-Listing"><a href="/v/fietsen/a1"><h3>Fiets</h3></a></li>
+<li class="hz-Listing"><a href="/v/auto-s/ford/a777"><span class="price">€ 2.100</span></a></li>
+</ul><a href="/v/auto-s/bmw/a2">Not inside a listing</a></body></html>"""
+
+
+def test_extract_car_urls(marktplaats):
+    candidates = marktplaats._extract_car_urls(SEARCH_RESULTS_HTML, 'https://www.marktplaats.nl')
+
+    # Non-car and untitled listings are skipped, as are links outside the listings
+    assert [c.url for c in candidates] == [
+        'https://www.marktplaats.nl/v/auto-s/volkswagen/a123-vw-polo',
+        'https://www.marktplaats.nl/v/auto-s/opel/a999-opel',
+    ]
+    polo, corsa = candidates
+    assert polo.title == 'Volkswagen Polo 1.2 TSI 2016 met schade'
+    assert polo.price == 3450.0
+    assert polo.image_url == 'https://images.marktplaats.com/1.jpg'
+    assert polo.location == 'Utrecht'
+    # Without a price element the price is found in the listing text
+    assert corsa.price == 1950.0
+    assert corsa.image_url is None
+    assert corsa.location == ''
+
+
+def test_extract_car_urls_empty_page(marktplaats):
+    assert marktplaats._extract_car_urls('', 'https://www.marktplaats.nl') == []
+
+
+@pytest.mark.parametrize('body, expected', [
+    ('<span>€ 5.000</span><span>120.000 km</span>', 5000.0),
+    ('<div>€ 2.500</div><div>2016</div>', 2500.0),
+])
+def test_extract_car_urls_price_next_to_other_fields(marktplaats, body, expected):
+    # The fallback price must not run into the text of the element after it
+    html = f'<ul><li class="hz-Listing"><a href="/v/auto-s/opel/a1"><h3>Opel Corsa</h3>{body}</a></li></ul>'
+    [candidate] = marktplaats._extract_car_urls(html, 'https://www.marktplaats.nl')
+    assert candidate.price == expected
+
+
+def test_parse_car_details_folds_search_term_accents(marktplaats):
+    # The model falls back to the search term, which may keep its accents
+    assert marktplaats._parse_car_details('Citroen met schade', 'Citroën C3') == ('Citroën', 'C3', None, None)
+
+
+def test_search_api_skips_malformed_listings(marktplaats, monkeypatch):
+    listings = [
+        {'vipUrl': None, 'title': 'Opel Corsa'},
+        {'vipUrl': '/v/auto-s/opel/a1', 'title': None},
+        {'vipUrl': '/v/auto-s/opel/a2', 'title': 'Opel Corsa', 'priceInfo': {'priceCents': 'n/a'}},
+        {'vipUrl': '/v/auto-s/opel/a3', 'title': 'Opel Astra', 'priceInfo': {'priceCents': 250000},
+         'location': {'cityName': None}},
+    ]
+
+    class Response:
+        status_code = 200
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {'listings': listings}
+
+    class Session:
+        async def get(self, url, params=None):
+            return Response()
+
+    async def no_delay():
+        pass
+    marktplaats.session = Session()
+    monkeypatch.setattr(marktplaats, 'random_delay', no_delay)
+    candidates = asyncio.run(marktplaats._search_api('opel', 2016))
+
+    assert [(c.url, c.price, c.location) for c in candidates] == [
+        ('https://www.marktplaats.nl/v/auto-s/opel/a3', 2500.0, ''),
+    ]
+
+
+SCHADEAUTOS_HTML = """<html><body><div class="list">
+<div class="item"><a href="/nl/schade/personenautos/volkswagen/polo/o/12345"><h2>Volkswagen Polo 1.0 TSI</h2>
+<img src="/gfx/icon.png" alt="1ste toelating: 2016"><img src="/gfx/km.png" alt="tellerstand: 125.000 km">
+<img src="/gfx/f.png" alt="brandstof: Benzine"><img src="/cache/picture/1.jpg" alt="schadeauto vw">
+<span>€ 3.250,-</span></a></div>
+<div class="item"><a href="/nl/schade/personenautos/alfa-romeo/mito/o/777"><h2>Alfa Romeo MiTo 1.4</h2>
+<p>2015 88.000 km diesel € 1.900</p></a></div>
+<a href="/nl/schade/personenautos/bmw">All BMWs</a>
+</div></body></html>"""
+
+
+def test_schadeautos_extract_car_data(schadeautos):
+    cars = schadeautos.extract_car_data(SCHADEAUTOS_HTML, 'https://www.schadeautos.nl')
+
+    assert [car['url'] for car in cars] == [
+        'https://www.schadeautos.nl/nl/schade/personenautos/volkswagen/polo/o/12345',
+        'https://www.schadeautos.nl/nl/schade/personenautos/alfa-romeo/mito/o/777',
+    ]
+    polo, mito = cars
+    # Year, mileage and fuel come from the image alt texts when present...
+    assert (polo['make'], polo['model'], polo['year'], polo['mileage'], polo['fuel_type']) == (
+        'Volkswagen', 'Polo', 2016, 125000, 'Benzine')
+    assert polo['price'] == 3250.0
+    assert polo['images'] == ['https://www.schadeautos.nl/cache/picture/1.jpg']
+    # ...and from the listing text otherwise
+    assert (mito['make'], mito['model'], mito['year'], mito['mileage'], mito['fuel_type']) == (
+        'Alfa Romeo', 'Mito', 2015, 88000, 'Diesel')
+    assert mito['price'] == 1900.0
+    assert mito['images'] == []